@@ -8,11 +8,13 @@ import logging
 import os
 import zipfile
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING
 from urllib.request import urlretrieve
 
+from gwv.packed import CJKSRC_MAGIC, PackedWriter
+
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Mapping
 
 logging.basicConfig()
 log = logging.getLogger(__name__)
@@ -20,6 +22,7 @@ log = logging.getLogger(__name__)
 CJKSRC_URL = "https://www.unicode.org/wg2/iso10646/edition5/data/CJKSrc.txt"
 UNIHAN_ZIP_URL = "https://www.unicode.org/Public/UCD/latest/ucd/Unihan.zip"
 CJKSRC_JSON_FILENAME = "cjksrc.json"
+CJKSRC_BIN_FILENAME = "cjksrc.bin"
 
 
 def get_iso_CJKSrc(url: str = CJKSRC_URL):
@@ -73,27 +76,66 @@ def parseCJKSrc(cjksrctxt: Iterable[str]):
     return result
 
 
+def writeCJKSrcbin(cjksrc: Mapping[str, list[str | None]], cjksrcbin: IO[bytes]):
+    """Write the CJK sources in the packed format read by gwv.helper.CJKSources
+
+    The records are stored column by column and indexed by code point."""
+    records = sorted((int(ucs[1:], 16), record) for ucs, record in cjksrc.items())
+    first_cp = records[0][0] if records else 0
+    n_columns = len(records[0][1]) if records else 0
+
+    cp2row = [0] * (records[-1][0] - first_cp + 1 if records else 0)
+    for row, (cp, _record) in enumerate(records):
+        cp2row[cp - first_cp] = row + 1
+
+    strings = sorted(
+        {value for _cp, record in records for value in record if value is not None}
+    )
+    string2id = {value: string_id for string_id, value in enumerate(strings, 1)}
+
+    writer = PackedWriter(cjksrcbin, CJKSRC_MAGIC)
+    writer.write_uint32_array([first_cp, n_columns])
+    writer.write_uint32_array(cp2row)
+    writer.write_string_array(strings)
+    for column in range(n_columns):
+        writer.write_uint32_array(
+            0 if record[column] is None else string2id[record[column]]
+            for _cp, record in records
+        )
+
+
 cjksrcjson_path = os.path.normpath(
     Path(__file__).parent / ".." / "gwv" / "data" / "3rd" / CJKSRC_JSON_FILENAME
 )
+cjksrcbin_path = os.path.normpath(
+    Path(__file__).parent / ".." / "gwv" / "data" / "3rd" / CJKSRC_BIN_FILENAME
+)
 
 
-def main(cjksrcjson_path: str | os.PathLike = cjksrcjson_path):
+def main(
+    cjksrcjson_path: str | os.PathLike = cjksrcjson_path,
+    cjksrcbin_path: str | os.PathLike = cjksrcbin_path,
+):
     cjksrcjson_path = Path(cjksrcjson_path)
-    if cjksrcjson_path.exists():
+    cjksrcbin_path = Path(cjksrcbin_path)
+    if cjksrcbin_path.exists():
         return
-    cjksrcjson_path.parent.mkdir(parents=True, exist_ok=True)
+    cjksrcbin_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if cjksrcjson_path.exists():
+        with cjksrcjson_path.open() as cjksrcjson_file:
+            cjksrc = json.load(cjksrcjson_file)
+    else:
+        cjksrc = get_unihan_CJKSrc()
 
-    cjksrc = get_unihan_CJKSrc()
+        with cjksrcjson_path.open("w") as cjksrcjson_file:
+            json.dump(cjksrc, cjksrcjson_file, separators=(",", ":"))
 
-    with cjksrcjson_path.open("w") as cjksrcjson_file:
-        json.dump(cjksrc, cjksrcjson_file, separators=(",", ":"))
+    with cjksrcbin_path.open("wb") as cjksrcbin:
+        writeCJKSrcbin(cjksrc, cjksrcbin)
 
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) >= 2:
-        main(sys.argv[1])
-    else:
-        main()
+    main(*sys.argv[1:3])
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import IO, Any
 from urllib.request import urlretrieve
 
+from gwv.packed import MJTABLE_MAGIC, PackedWriter
+
 from .strict_xlsx import iterxlsx
 
 logging.basicConfig()
@@ -17,6 +19,7 @@ log = logging.getLogger(__name__)
 
 MJ_XLSX_URL = "https://moji.or.jp/wp-content/uploads/2024/01/mji.00602.xlsx"
 MJ_JSON_FILENAME = "mj.json"
+MJ_BIN_FILENAME = "mj.bin"
 
 
 def kuten2gl(ku: int, ten: int):
@@ -116,32 +119,79 @@ def parseMjxlsx(mjxlsx: IO[bytes]):
     return mjdat
 
 
+def writeMjbin(mjdat: list[list], mjbin: IO[bytes]):
+    """Write the MJ table in the packed format read by gwv.validators.mj.MJTable"""
+    n_fields = len(mjdat[0]) if mjdat else 13
+    writer = PackedWriter(mjbin, MJTABLE_MAGIC)
+    writer.write_uint32_array([len(mjdat), n_fields])
+    for field in range(n_fields):
+        key2rows: dict[str, list[int]] = defaultdict(list)
+        row_keys: list[list[str]] = []
+        for mjIdx, row in enumerate(mjdat):
+            keys = row[field]
+            if keys is None:
+                keys = []
+            elif not isinstance(keys, list):
+                keys = [keys]
+            keys = [key.lower() for key in keys]
+            for key in keys:
+                key2rows[key].append(mjIdx)
+            row_keys.append(keys)
+
+        sorted_keys = sorted(key2rows)
+        key2idx = {key: key_idx for key_idx, key in enumerate(sorted_keys)}
+        writer.write_string_array(sorted_keys)
+
+        key_offsets = [0]
+        for key in sorted_keys:
+            key_offsets.append(key_offsets[-1] + len(key2rows[key]))
+        writer.write_uint32_array(key_offsets)
+        writer.write_uint32_array(idx for key in sorted_keys for idx in key2rows[key])
+
+        row_offsets = [0]
+        for keys in row_keys:
+            row_offsets.append(row_offsets[-1] + len(keys))
+        writer.write_uint32_array(row_offsets)
+        writer.write_uint32_array(key2idx[key] for keys in row_keys for key in keys)
+
+
 mjjson_path = os.path.normpath(
     Path(__file__).parent / ".." / "gwv" / "data" / "3rd" / MJ_JSON_FILENAME
 )
+mjbin_path = os.path.normpath(
+    Path(__file__).parent / ".." / "gwv" / "data" / "3rd" / MJ_BIN_FILENAME
+)
 
 
-def main(mjjson_path: str | os.PathLike = mjjson_path):
+def main(
+    mjjson_path: str | os.PathLike = mjjson_path,
+    mjbin_path: str | os.PathLike = mjbin_path,
+):
     mjjson_path = Path(mjjson_path)
-    if mjjson_path.exists():
+    mjbin_path = Path(mjbin_path)
+    if mjbin_path.exists():
         return
-    mjjson_path.parent.mkdir(parents=True, exist_ok=True)
+    mjbin_path.parent.mkdir(parents=True, exist_ok=True)
 
-    log.info("Downloading %s", MJ_XLSX_URL)
-    filename, _headers = urlretrieve(MJ_XLSX_URL)
-    log.info("Download completed")
+    if mjjson_path.exists():
+        with mjjson_path.open() as mjjson_file:
+            mjdat = json.load(mjjson_file)
+    else:
+        log.info("Downloading %s", MJ_XLSX_URL)
+        filename, _headers = urlretrieve(MJ_XLSX_URL)
+        log.info("Download completed")
 
-    with Path(filename).open("rb") as mjxlsx:
-        mjdat = parseMjxlsx(mjxlsx)
+        with Path(filename).open("rb") as mjxlsx:
+            mjdat = parseMjxlsx(mjxlsx)
 
-    with mjjson_path.open("w") as mjjson_file:
-        json.dump(mjdat, mjjson_file, separators=(",", ":"))
+        with mjjson_path.open("w") as mjjson_file:
+            json.dump(mjdat, mjjson_file, separators=(",", ":"))
+
+    with mjbin_path.open("wb") as mjbin:
+        writeMjbin(mjdat, mjbin)
 
 
 if __name__ == "__main__":
     import sys
 
-    if len(sys.argv) >= 2:
-        main(sys.argv[1])
-    else:
-        main()
+    main(*sys.argv[1:3])
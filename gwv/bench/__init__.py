@@ -0,0 +1,4 @@
+"""Benchmarks of the validators on synthetic dumps.
+
+The modules in this package are not used during validation.  The suite is
+run with the gwv-bench command."""
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gwv.bench.compare import (
+    CORPUS_SIZE,
+    DEFAULT_BASELINE,
+    compare_reports,
+    run_corpus,
+)
+from gwv.bench.suite import DEFAULT_SIZES, run_suite
+from gwv.validators import all_validator_names
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _parse_sizes(s: str) -> list[int]:
+    return [int(size) for size in s.split(",")]
+
+
+def _write_json(report: dict[str, Any], path: Path | None) -> None:
+    outfile = sys.stdout if path is None else path.open("w")
+    try:
+        json.dump(report, outfile, indent=2, sort_keys=True)
+        outfile.write("\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+def main(args: Sequence[str] | None = None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        prog="gwv-bench", description="Benchmark the validators on synthetic dumps"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run", help="Run the benchmarks and write the measurements as JSON"
+    )
+    run_parser.add_argument(
+        "--sizes",
+        type=_parse_sizes,
+        default=list(DEFAULT_SIZES),
+        metavar="N,...",
+        help="Comma-separated numbers of glyphs of the dumps "
+        f"(default: {','.join(map(str, DEFAULT_SIZES))})",
+    )
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "-o", "--out", help="File to write to (default: standard output)", type=Path
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help=f"Run the benchmarks on the fixed corpus of {CORPUS_SIZE} glyphs and "
+        "fail if a validator is slower or uses more memory than the baseline",
+    )
+    compare_parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path(DEFAULT_BASELINE),
+        metavar="FILE",
+        help=f"Baseline measurements (default: {DEFAULT_BASELINE})",
+    )
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        metavar="RATIO",
+        help="Allowed relative increase of the time of each phase (default: 0.25)",
+    )
+    compare_parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.1,
+        metavar="RATIO",
+        help="Allowed relative increase of the peak RSS (default: 0.1)",
+    )
+    compare_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Number of runs to take the best measurements of (default: 3)",
+    )
+    compare_parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Write the measurements to the baseline file instead of comparing",
+    )
+
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument(
+            "-n",
+            "--names",
+            nargs="*",
+            help="Names of validators (default: those not using the network)",
+        )
+    opts = parser.parse_args(args)
+
+    if opts.names and not set(opts.names) <= set(all_validator_names):
+        parser.error(f"unknown validator: {' '.join(opts.names)}")
+
+    if opts.command == "run":
+        _write_json(run_suite(opts.sizes, opts.names or None, seed=opts.seed), opts.out)
+        return
+
+    if not opts.update and not opts.baseline.exists():
+        parser.error(f"baseline {opts.baseline} not found; create it with --update")
+    current = run_corpus(opts.names or None, repeat=opts.repeat)
+    if opts.update:
+        opts.baseline.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(current, opts.baseline)
+        return
+    with opts.baseline.open() as f:
+        baseline = json.load(f)
+    regressions, missing = compare_reports(
+        baseline,
+        current,
+        tolerance=opts.tolerance,
+        memory_tolerance=opts.memory_tolerance,
+    )
+    for name in missing:
+        print(f"{name}: not in the baseline", file=sys.stderr)
+    for regression in regressions:
+        print(regression.describe())
+    if regressions:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Comparison of benchmark results with a baseline.
+
+The baseline is a report of gwv.bench.suite.run_suite on the fixed corpus
+(CORPUS_SIZE glyphs generated with CORPUS_SEED), committed to the repository
+as benchmarks/baseline.json.  As it is measured on another machine, the
+times are compared after scaling the baseline by the ratio of the times of a
+calibration loop run with each report, and the memory is compared as the
+growth of the RSS over the process holding the dump.  A validator regresses
+when the time of a phase or its RSS growth exceeds the scaled baseline by
+more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from gwv.bench.suite import run_suite
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+CORPUS_SIZE = 20000
+CORPUS_SEED = 0
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+PHASES = ("setup", "validate", "get_result")
+
+# Differences below these are treated as noise regardless of the tolerance
+MIN_TIME_DIFF = 0.05
+MIN_RSS_DIFF_KB = 4096
+
+
+def _calibration_loop() -> int:
+    # Parsing and indexing of strings like the validators do, without using
+    # gwv so that changes of the code do not change the calibration
+    index: dict[str, int] = {}
+    for i in range(200000):
+        fields = f"1:0:0:{i}:{i % 200}:{i % 7}".split(":")
+        index[fields[3]] = int(fields[4]) + int(fields[5])
+    return len(index)
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Return the best time of the calibration loop in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _calibration_loop()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Regression(NamedTuple):
+    validator: str
+    # "setup", "validate", "get_result", "memory" (RSS growth) or "error"
+    phase: str
+    baseline: float | None
+    current: float | None
+
+    def describe(self) -> str:
+        if self.phase == "error":
+            return f"{self.validator}: failed to run"
+        assert self.baseline is not None
+        assert self.current is not None
+        change = (self.current / self.baseline - 1) * 100 if self.baseline else 0.0
+        if self.phase == "memory":
+            values = f"{self.baseline:.0f}KB -> {self.current:.0f}KB"
+        else:
+            values = f"{self.baseline:.3f}s -> {self.current:.3f}s"
+        return f"{self.validator}: {self.phase} regressed, {values} ({change:+.1f}%)"
+
+
+def run_corpus(
+    validator_names: Sequence[str] | None = None, *, repeat: int = 1
+) -> dict[str, Any]:
+    """Run the suite on the fixed corpus, keeping the smallest time and RSS
+    of each validator over repeat runs, and the smallest calibration time."""
+    # The loop is run around every run so that a change of the load of the
+    # machine affects it as well
+    calibration = calibrate()
+    report = run_suite([CORPUS_SIZE], validator_names, seed=CORPUS_SEED)
+    best = report["sizes"][str(CORPUS_SIZE)]["validators"]
+    for _ in range(repeat - 1):
+        calibration = min(calibration, calibrate())
+        again = run_suite([CORPUS_SIZE], validator_names, seed=CORPUS_SEED)
+        for name, measurements in again["sizes"][str(CORPUS_SIZE)][
+            "validators"
+        ].items():
+            if "error" in measurements or "error" in best[name]:
+                continue
+            for key in (*PHASES, "peak_rss_kb", "rss_growth_kb"):
+                if measurements[key] is not None:
+                    best[name][key] = min(best[name][key], measurements[key])
+            best[name]["glyphs_per_sec"] = CORPUS_SIZE / best[name]["validate"]
+    report["calibration"] = min(calibration, calibrate())
+    return report
+
+
+def _memory_key(base: dict[str, Any], measurements: dict[str, Any]) -> str:
+    # Reports made before rss_growth_kb was recorded have only the peak
+    if (
+        base.get("rss_growth_kb") is not None
+        and measurements.get("rss_growth_kb") is not None
+    ):
+        return "rss_growth_kb"
+    return "peak_rss_kb"
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    tolerance: float = 0.25,
+    memory_tolerance: float = 0.1,
+) -> tuple[list[Regression], list[str]]:
+    """Compare the reports on the corpus and return the regressions and the
+    names of the validators missing from the baseline.
+
+    tolerance and memory_tolerance are the allowed relative increases of the
+    time of each phase and of the RSS growth.  The times of the baseline are
+    scaled by the ratio of the calibration times if both reports have one."""
+    size = str(CORPUS_SIZE)
+    base_validators: dict[str, dict[str, Any]] = baseline["sizes"][size]["validators"]
+    scale = 1.0
+    if baseline.get("calibration") and current.get("calibration"):
+        scale = current["calibration"] / baseline["calibration"]
+    regressions: list[Regression] = []
+    missing: list[str] = []
+    for name, measurements in current["sizes"][size]["validators"].items():
+        base = base_validators.get(name)
+        if base is None or "error" in base:
+            missing.append(name)
+            continue
+        if "error" in measurements:
+            regressions.append(Regression(name, "error", None, None))
+            continue
+        for phase in PHASES:
+            base_time = base[phase] * scale
+            if (
+                measurements[phase] > base_time * (1 + tolerance)
+                and measurements[phase] - base_time > MIN_TIME_DIFF
+            ):
+                regressions.append(
+                    Regression(name, phase, base_time, measurements[phase])
+                )
+        key = _memory_key(base, measurements)
+        base_rss = base.get(key)
+        rss = measurements.get(key)
+        if (
+            base_rss is not None
+            and rss is not None
+            and rss > base_rss * (1 + memory_tolerance)
+            and rss - base_rss > MIN_RSS_DIFF_KB
+        ):
+            regressions.append(Regression(name, "memory", base_rss, rss))
+    return regressions, missing
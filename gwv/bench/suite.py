@@ -0,0 +1,132 @@
+"""Benchmark suite of the validators on synthetic dumps.
+
+Usage: gwv-bench run [--sizes N,...] [-n NAME ...] [--seed SEED] [-o OUTFILE]
+
+For each size, it generates a dump with gwv.bench.synth and runs validate()
+for each validator alone, recording the time of each phase, the throughput,
+the peak RSS and the allocations as JSON.  It needs no access to GlyphWiki;
+the validators fetching data from it are left out unless named explicitly.
+
+On platforms where processes can be forked, each validator runs in a child
+process so that its peak RSS is not hidden by the validators run before it.
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import platform
+import sys
+import time
+from typing import TYPE_CHECKING, Any
+
+from gwv.bench.synth import generate_dump
+from gwv.memreport import current_rss_kb, peak_rss_kb
+from gwv.validator import validate
+from gwv.validators import all_validator_names
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from multiprocessing.connection import Connection
+
+    from gwv.dump import Dump
+
+FORMAT_VERSION = 1
+
+DEFAULT_SIZES = (10000, 100000)
+
+# Validators that download groups of GlyphWiki
+NETWORK_VALIDATORS = frozenset({"j", "naming", "width"})
+
+offline_validator_names = [
+    name for name in all_validator_names if name not in NETWORK_VALIDATORS
+]
+
+
+def _gc_collections() -> int:
+    return sum(stats["collections"] for stats in gc.get_stats())
+
+
+def measure_validator(dump: Dump, name: str) -> dict[str, Any]:
+    """Run validate() with a single validator and return its measurements."""
+    gc.collect()
+    start_rss = current_rss_kb()
+    blocks = sys.getallocatedblocks()
+    collections = _gc_collections()
+    phase_times: dict[str, float] = {}
+    result = validate(dump, [name], setup_workers=1, phase_times=phase_times)
+    peak_rss = peak_rss_kb()
+    return {
+        **phase_times,
+        "glyphs_per_sec": len(dump) / phase_times["validate"],
+        "errors": sum(len(rows) for rows in result[name]["result"].values()),
+        "peak_rss_kb": peak_rss,
+        # Growth over the RSS at the start, which includes the dump
+        "rss_growth_kb": (
+            peak_rss - start_rss
+            if peak_rss is not None and start_rss is not None
+            else None
+        ),
+        # Blocks still allocated while the result is alive
+        "retained_blocks": sys.getallocatedblocks() - blocks,
+        "gc_collections": _gc_collections() - collections,
+    }
+
+
+def _measure_in_child(dump: Dump, name: str, conn: Connection) -> None:
+    try:
+        conn.send(measure_validator(dump, name))
+    except Exception as exc:  # noqa: BLE001
+        conn.send({"error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        conn.close()
+
+
+def _measure_isolated(dump: Dump, name: str) -> dict[str, Any]:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        try:
+            return measure_validator(dump, name)
+        except Exception as exc:  # noqa: BLE001
+            return {"error": f"{type(exc).__name__}: {exc}"}
+    # The child shares the dump with the parent without pickling it
+    ctx = multiprocessing.get_context("fork")
+    recv_conn, send_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_measure_in_child, args=(dump, name, send_conn))
+    proc.start()
+    send_conn.close()
+    try:
+        measurements: dict[str, Any] = recv_conn.recv()
+    except EOFError:
+        measurements = {"error": f"Process exited with code {proc.exitcode}"}
+    proc.join()
+    return measurements
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    validator_names: Sequence[str] | None = None,
+    *,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Run the benchmarks and return the report."""
+    if validator_names is None:
+        validator_names = offline_validator_names
+    report: dict[str, Any] = {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": {},
+    }
+    for size in sizes:
+        start = time.perf_counter()
+        dump = generate_dump(size, seed)
+        generate_time = time.perf_counter() - start
+        report["sizes"][str(size)] = {
+            "generate": generate_time,
+            "validators": {
+                name: _measure_isolated(dump, name) for name in validator_names
+            },
+        }
+        del dump
+    return report
@@ -0,0 +1,214 @@
+"""Generator of synthetic GlyphWiki dumps.
+
+Usage: python -m gwv.bench.synth N OUTFILE [--seed SEED]
+
+The dumps mimic the shape of dump_newest_only.txt: families of glyphs for each
+code point (the UCS glyph, regional variants, henka parts, variants and
+itaiji), IDS, koseki, toki, cdp, non-kanji and user-owned glyphs, with
+aliases, glyphs built from parts quoting other parts, and glyphs made of many
+strokes.  The same N and seed always give the same dump, so the benchmarks
+built on it can run without GlyphWiki.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from gwv.dump import Dump
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator, Sequence
+
+TIMESTAMP = 1700000000.0
+
+# Code point ranges of CJK unified ideographs the families are made for
+_KANJI_RANGES = (
+    (0x4E00, 0xA000),
+    (0x3400, 0x4DC0),
+    (0x20000, 0x2A6E0),
+    (0x2A700, 0x2B740),
+    (0x2B820, 0x2CEB0),
+    (0x30000, 0x31350),
+)
+_REGIONS = ("g", "t", "j", "k", "v", "h", "jv", "kv", "ja", "u")
+_IDCS = ("u2ff0", "u2ff1", "u2ff4", "u2ff8")
+_HEADS = (0, 2, 12, 22, 32)
+_TAILS = (0, 2, 13, 23, 24, 32, 313)
+
+
+def _iter_codepoints() -> Iterator[int]:
+    for stt, end in _KANJI_RANGES:
+        yield from range(stt, end)
+
+
+def _stroke(rng: random.Random) -> str:
+    def c() -> int:
+        return rng.randrange(10, 191)
+
+    kind = rng.random()
+    if kind < 0.55:
+        # Horizontal or vertical straight line
+        shape = f"1:{rng.choice(_HEADS)}:{rng.choice(_TAILS)}"
+        stt = rng.randrange(10, 100)
+        end = stt + rng.randrange(20, 90)
+        pos = c()
+        if kind < 0.3:
+            return f"{shape}:{stt}:{pos}:{end}:{pos}"
+        return f"{shape}:{pos}:{stt}:{pos}:{end}"
+    if kind < 0.7:
+        return f"2:32:7:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}"
+    if kind < 0.8:
+        return f"2:7:8:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}"
+    if kind < 0.9:
+        return f"3:0:5:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}"
+    if kind < 0.95:
+        return f"6:7:7:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}"
+    return f"7:32:7:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}:{c()}"
+
+
+def _strokes(rng: random.Random, n_min: int, n_max: int) -> str:
+    return "$".join(_stroke(rng) for _ in range(rng.randint(n_min, n_max)))
+
+
+def _parts(rng: random.Random, parts: Sequence[str]) -> str:
+    if not parts:
+        return _strokes(rng, 3, 12)
+    # Side by side or one above the other, quoting an older version at times
+    names = [rng.choice(parts) for _ in range(rng.choice((2, 2, 3)))]
+    if rng.random() < 0.02:
+        names[0] += f"@{rng.randint(1, 9)}"
+    step = 200 // len(names)
+    vertical = rng.random() < 0.4
+    lines = []
+    for i, name in enumerate(names):
+        if vertical:
+            box = (0, i * step, 200, (i + 1) * step)
+        else:
+            box = (i * step, 0, (i + 1) * step, 200)
+        lines.append("99:0:0:{}:{}:{}:{}:".format(*box) + name)
+    return "$".join(lines)
+
+
+def _alias(entity: str) -> str:
+    return "99:0:0:0:0:200:200:" + entity
+
+
+def generate(n_glyphs: int, seed: int = 0) -> dict[str, tuple[str, str]]:
+    """Return the data of a synthetic dump of n_glyphs glyphs, mapping each
+    glyph name to (related, gdata)."""
+    rng = random.Random(seed)
+    data: dict[str, tuple[str, str]] = {}
+    parts: list[str] = []
+    n_koseki = n_toki = n_cdp = n_hikanji = n_user = 0
+
+    def add(name: str, related: str, gdata: str) -> bool:
+        if len(data) >= n_glyphs:
+            return False
+        data[name] = (related, gdata)
+        return True
+
+    # Code points are reused with new variant numbers once they run out
+    round_ = 0
+    while len(data) < n_glyphs:
+        for cp in _iter_codepoints():
+            ucs = f"u{cp:04x}"
+            if round_ > 0:
+                # Further variants of an existing family
+                entity = f"{ucs}-var-{round_:03d}"
+                if not add(entity, ucs, _parts(rng, parts)):
+                    break
+                if rng.random() < 0.5:
+                    add(f"{ucs}-itaiji-{round_:03d}", ucs, _alias(entity))
+                continue
+
+            # The UCS glyph, either built from parts or drawn with strokes
+            if rng.random() < 0.7:
+                gdata = _parts(rng, parts)
+            else:
+                gdata = _strokes(rng, 8, 25)
+            if not add(ucs, ucs, gdata):
+                break
+            # Regional variants, mostly aliases of the UCS glyph
+            for region in rng.sample(_REGIONS, rng.randint(0, 3)):
+                if rng.random() < 0.8:
+                    add(f"{ucs}-{region}", ucs, _alias(ucs))
+                else:
+                    add(f"{ucs}-{region}", ucs, _strokes(rng, 6, 20))
+            # Henka parts; some quote another part or are its alias
+            for henka in rng.sample(range(1, 15), rng.randint(0, 3)):
+                part = f"{ucs}-{henka:02d}"
+                r = rng.random()
+                if parts and r < 0.15:
+                    gdata = _alias(rng.choice(parts))
+                elif parts and r < 0.4:
+                    gdata = (
+                        "99:0:0:0:0:200:200:"
+                        + rng.choice(parts)
+                        + "$"
+                        + _strokes(rng, 1, 4)
+                    )
+                else:
+                    gdata = _strokes(rng, 3, 12)
+                add(part, ucs, gdata)
+                parts.append(part)
+            if rng.random() < 0.1:
+                add(f"{ucs}-var-001", ucs, _strokes(rng, 6, 20))
+            if rng.random() < 0.05:
+                add(f"{ucs}-itaiji-001", ucs, _parts(rng, parts))
+            # Koseki and toki glyphs for some of the code points
+            if rng.random() < 0.15:
+                n_koseki += 1
+                koseki = f"koseki-{n_koseki * 10:06d}"
+                add(koseki, ucs, _alias(ucs))
+                if rng.random() < 0.5:
+                    n_toki += 1
+                    add(f"toki-{n_toki * 10:08d}", ucs, _alias(koseki))
+            if rng.random() < 0.08:
+                idc = rng.choice(_IDCS)
+                other = f"u{rng.randrange(0x4E00, 0x9FA0):04x}"
+                add(f"{idc}-{ucs}-{other}", ucs, _alias(ucs))
+            if rng.random() < 0.04:
+                n_cdp += 1
+                add(f"cdp-{0x8C40 + n_cdp:04x}", ucs, _alias(ucs))
+            if rng.random() < 0.05:
+                # Non-kanji glyphs in a private use plane
+                n_hikanji += 1
+                add(f"u{0xF0000 + n_hikanji:05x}", "u3013", _strokes(rng, 1, 5))
+            if rng.random() < 0.05:
+                n_user += 1
+                add(f"user_{n_user}", "u3013", _parts(rng, parts))
+            if len(data) >= n_glyphs:
+                break
+        round_ += 1
+    return data
+
+
+def generate_dump(n_glyphs: int, seed: int = 0) -> Dump:
+    return Dump(generate(n_glyphs, seed), TIMESTAMP)
+
+
+def write_dump(data: dict[str, tuple[str, str]], path: str | os.PathLike) -> None:
+    """Write the data in the format of dump_newest_only.txt."""
+    with Path(path).open("w") as f:
+        f.write(" name | related | data\n")
+        f.write("-----\n")
+        for name, (related, gdata) in data.items():
+            f.write(f" {name} | {related} | {gdata}\n")
+
+
+def main(args: Sequence[str] | None = None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dump")
+    parser.add_argument("n_glyphs", type=int, help="Number of glyphs")
+    parser.add_argument("outfile", type=Path)
+    parser.add_argument("--seed", type=int, default=0)
+    opts = parser.parse_args(args)
+
+    write_dump(generate(opts.n_glyphs, opts.seed), opts.outfile)
+
+
+if __name__ == "__main__":
+    main()
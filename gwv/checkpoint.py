@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Mapping
+
+    from gwv.validators import Validator
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def selection_digest(glyphnames: Iterable[str]) -> str:
+    """Return a hash of the names of the glyphs selected for a run."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in glyphnames:
+        h.update(name.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _normalize_options(options: Mapping[str, Mapping[str, Any]]) -> Any:
+    # As they are read back from the file
+    return json.loads(json.dumps(options, sort_keys=True))
+
+
+class Checkpoint:
+    """Periodic snapshot of the progress of a validation run.
+
+    A checkpoint records the name of the last glyph that has been validated by
+    all validators, together with the state of each validator (see
+    Validator.get_state), so that an interrupted run can be resumed from there.
+    It also records the glyphs selected for the run and the validator options,
+    which the resumed run must have the same.
+    """
+
+    def __init__(self, path: str | os.PathLike, interval: int = 10000):
+        self.path = Path(path)
+        self.interval = interval
+
+    def save(
+        self,
+        timestamp: float,
+        last_glyphname: str,
+        validator_instances: Mapping[str, Validator],
+        *,
+        selection: str,
+        validator_options: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        """Save the progress.  selection is the selection_digest of the
+        glyphs selected for the run."""
+        data = {
+            "version": CHECKPOINT_FORMAT_VERSION,
+            "timestamp": timestamp,
+            "validators": list(validator_instances),
+            "selection": selection,
+            "validator_options": _normalize_options(validator_options),
+            "last_glyphname": last_glyphname,
+            "states": {
+                name: val.get_state() for name, val in validator_instances.items()
+            },
+        }
+        # Write to a temporary file first so that a crash while saving does
+        # not destroy the previous checkpoint
+        tmppath = self.path.with_name(self.path.name + ".tmp")
+        with tmppath.open("w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmppath.replace(self.path)
+        log.info("Saved checkpoint at %s", last_glyphname)
+
+    def load(
+        self,
+        timestamp: float,
+        validator_instances: Mapping[str, Validator],
+        *,
+        selection: str,
+        validator_options: Mapping[str, Mapping[str, Any]],
+    ) -> str | None:
+        """Restore the validator states from the checkpoint file.
+
+        It returns the name of the last validated glyph, or None if there is no
+        checkpoint to resume from.
+        It raises a ValueError if the checkpoint was made for a different dump,
+        a different set of validators, a different selection of glyphs or
+        different validator options."""
+        if not self.path.exists():
+            log.warning("Checkpoint %s not found; starting from scratch", self.path)
+            return None
+        with self.path.open() as f:
+            data: dict[str, Any] = json.load(f)
+
+        if data.get("version") != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {data.get('version')!r}")
+        if data["timestamp"] != timestamp:
+            raise ValueError("The checkpoint was made for a different dump")
+        if data["validators"] != list(validator_instances):
+            raise ValueError("The checkpoint was made for different validators")
+        if data["selection"] != selection:
+            raise ValueError("The checkpoint was made for a different selection")
+        if data["validator_options"] != _normalize_options(validator_options):
+            raise ValueError("The checkpoint was made with different options")
+
+        for name, val in validator_instances.items():
+            val.set_state(data["states"][name])
+        last_glyphname: str = data["last_glyphname"]
+        log.info("Resuming from checkpoint after %s", last_glyphname)
+        return last_glyphname
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
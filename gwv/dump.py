@@ -6,9 +6,13 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from gwv.kagedata import KageData, get_entity_name
+from gwv.relations import GlyphRelations
 
 if TYPE_CHECKING:
     import os
+    from collections.abc import Iterator, Mapping
+
+    from gwv.versionstore import VersionStore
 
 
 @dataclass(frozen=True)
@@ -31,7 +35,7 @@ class DumpEntry:
 
 
 class Dump:
-    def __init__(self, data: dict[str, tuple[str, str]], timestamp: float):
+    def __init__(self, data: Mapping[str, tuple[str, str]], timestamp: float):
         self._data = data
         self.timestamp = timestamp
 
@@ -62,17 +66,48 @@ class Dump:
 
     _get_alias_of_dic: dict[str, list[str]] | None = None
 
-    def get_alias_of(self, name: str):
+    def _iter_aliases(self) -> Iterator[tuple[str, str]]:
+        """Iterate over (alias name, entity name) in the order of the dump."""
+        for gname, (_rel, data) in self._data.items():
+            entity_name = get_entity_name(data)
+            if entity_name is not None and entity_name != gname:
+                yield gname, entity_name
+
+    def _build_alias_of_dic(self) -> dict[str, list[str]]:
         if self._get_alias_of_dic is None:
-            dic = self._get_alias_of_dic = {}
-            for gname in self._data:
+            dic: dict[str, list[str]] = {}
+            for gname, entity_name in self._iter_aliases():
                 if gname in dic:
                     continue
-                entity_name = self.get_entity_name(gname)
-                if entity_name == gname:
-                    continue
                 dic.setdefault(entity_name, [entity_name]).append(gname)
-        return self._get_alias_of_dic.get(name, [name])
+            self._get_alias_of_dic = dic
+        return self._get_alias_of_dic
+
+    def get_alias_of(self, name: str):
+        return self._build_alias_of_dic().get(name, [name])
+
+    versions: VersionStore | None = None
+    """All versions of the glyphs, if available (see gwv.versionstore)"""
+
+    _relations: GlyphRelations | None = None
+
+    @property
+    def relations(self) -> GlyphRelations:
+        """Relationships between the glyphs derived from their names"""
+        if self._relations is None:
+            self._relations = GlyphRelations(self._data)
+        return self._relations
+
+    def prepare(self, index: str) -> None:
+        """Build the lazily computed index now.
+
+        index is "aliases" (used by get_alias_of) or "relations"."""
+        if index == "aliases":
+            self._build_alias_of_dic()
+        elif index == "relations":
+            self.relations  # noqa: B018
+        else:
+            raise ValueError(f"Unknown dump index: {index!r}")
 
     @classmethod
     def open(cls, filepath: str | os.PathLike):
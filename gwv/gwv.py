@@ -4,26 +4,64 @@ from __future__ import annotations
 
 import argparse
 import json
+import logging
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from gwv import version
+from gwv.checkpoint import Checkpoint
 from gwv.dump import Dump
-from gwv.validator import validate
+from gwv.memreport import MemoryReport
+from gwv.progress import ProgressReporter
+from gwv.resultcache import ResultCache
+from gwv.resultformat import write_v2
+from gwv.resultstore import ResultStore
+from gwv.selector import all_categories, read_glyph_list, select_glyphs
+from gwv.sqlitedump import SQLiteDump
+from gwv.validator import get_validator_option_names, validate
+from gwv.validators import all_validator_names
+from gwv.versionstore import VersionStore
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
 
+def parse_validator_option(s: str) -> tuple[str, str, Any]:
+    """Parse VALIDATOR.KEY=VALUE, where VALUE is a JSON value or a string."""
+    name, sep, value = s.partition("=")
+    val_name, dot, key = name.partition(".")
+    if not sep or not dot or not val_name or not key:
+        msg = f"invalid validator option: {s!r}"
+        raise argparse.ArgumentTypeError(msg)
+    try:
+        return val_name, key, json.loads(value)
+    except ValueError:
+        return val_name, key, value
+
+
 def main(args: Sequence[str] | None = None):
     if args is None:
         args = sys.argv[1:]
 
     parser = argparse.ArgumentParser(description="GlyphWiki data validator")
-    parser.add_argument("dumpfile", type=Path)
     parser.add_argument(
-        "-o", "--out", help="File to write the output JSON to", type=Path
+        "dumpfile",
+        type=Path,
+        help="dump_newest_only.txt, or a database (.db) made by gwv-import-dump",
+    )
+    parser.add_argument(
+        "-o",
+        "--out",
+        help="File (or directory for --format v2) to write the output to",
+        type=Path,
+    )
+    parser.add_argument(
+        "--format",
+        choices=["v1", "v2"],
+        default="v1",
+        help="Output format: v1 writes a single JSON file, v2 writes a directory "
+        "of compressed per-error-code shards with a manifest (default: v1)",
     )
     parser.add_argument(
         "--ignore-error",
@@ -31,17 +69,215 @@ def main(args: Sequence[str] | None = None):
         help="Ignore runtime errors and resume validation of next glyph",
     )
     parser.add_argument("-n", "--names", nargs="*", help="Names of validators")
+    parser.add_argument(
+        "-O",
+        "--option",
+        metavar="VALIDATOR.KEY=VALUE",
+        action="append",
+        default=[],
+        type=parse_validator_option,
+        help="Option passed to a validator, e.g. donotuse.report_chain=true or "
+        "skew.limit=1000 (can be given multiple times)",
+    )
+    parser.add_argument(
+        "--glyphs",
+        metavar="FILE",
+        help="File listing the names of glyphs to validate, one per line",
+        type=Path,
+    )
+    parser.add_argument(
+        "--glob",
+        metavar="PATTERN",
+        action="append",
+        help="Validate only glyphs whose names match the wildcard pattern "
+        "(can be given multiple times)",
+    )
+    parser.add_argument(
+        "--category",
+        metavar="CATEGORIES",
+        type=lambda s: s.split(","),
+        help="Validate only glyphs of the comma-separated categories ("
+        + ", ".join(all_categories)
+        + ")",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="File to periodically save the progress of validation to",
+        type=Path,
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=int,
+        default=10000,
+        metavar="N",
+        help="Number of glyphs to validate between checkpoints (default: 10000)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume validation from the file given by --checkpoint",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Run content-local validators on every glyph even if its data is "
+        "shared with another glyph",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="FILE",
+        help="File to cache the results of content-local validators in across runs",
+        type=Path,
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        metavar="MB",
+        help="Maximum size of the cache in megabytes (default: 1024)",
+    )
+    parser.add_argument(
+        "--setup-workers",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Number of threads to set up the validators in (default: 4)",
+    )
+    parser.add_argument(
+        "--versions",
+        metavar="FILE",
+        help="Database of all versions of the glyphs made by gwv-import-versions, "
+        "used to report how old the quoted versions are",
+        type=Path,
+    )
+    parser.add_argument(
+        "--store",
+        metavar="FILE",
+        help="SQLite database to add the results to, keeping those of earlier runs",
+        type=Path,
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show the progress of validation on the standard error",
+    )
+    parser.add_argument(
+        "--progress-textfile",
+        metavar="FILE",
+        help="Prometheus text file to write the progress and throughput to",
+        type=Path,
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Seconds between updates of the progress (default: 5)",
+    )
+    parser.add_argument(
+        "--memory-report",
+        metavar="FILE",
+        help="Write the memory usage at the end of each phase, and the memory "
+        "retained by each validator, as JSON to the file (slows the run down)",
+        type=Path,
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show informational log messages"
+    )
     parser.add_argument("-v", "--version", action="version", version=version)
     opts = parser.parse_args(args)
+    if opts.resume and opts.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if opts.category is not None and not set(opts.category) <= set(all_categories):
+        parser.error(f"unknown category in --category: {','.join(opts.category)}")
+
+    validator_options: dict[str, dict[str, Any]] = {}
+    for val_name, key, value in opts.option:
+        if val_name not in all_validator_names:
+            parser.error(f"unknown validator in --option: {val_name}")
+        if key not in get_validator_option_names(val_name):
+            parser.error(f"unknown option of {val_name} in --option: {key}")
+        validator_options.setdefault(val_name, {})[key] = value
+
+    logging.basicConfig(level=logging.INFO if opts.verbose else logging.WARNING)
+
+    memory_report = MemoryReport() if opts.memory_report is not None else None
 
     dump_path: Path = opts.dumpfile
-    outpath: Path = opts.out or dump_path.with_name("gwv_result.json")
-    dump = Dump.open(dump_path)
+    if opts.format == "v2":
+        outpath: Path = opts.out or dump_path.with_name("gwv_result")
+    else:
+        outpath = opts.out or dump_path.with_name("gwv_result.json")
+    if dump_path.suffix in (".db", ".sqlite"):
+        dump: Dump = SQLiteDump(dump_path)
+    else:
+        dump = Dump.open(dump_path)
+
+    if opts.versions is not None:
+        dump.versions = VersionStore(opts.versions)
+    if memory_report is not None:
+        memory_report.phase("load")
+
+    glyphnames = None
+    if opts.glyphs is not None or opts.glob is not None or opts.category is not None:
+        glyphnames = select_glyphs(
+            dump,
+            read_glyph_list(opts.glyphs) if opts.glyphs is not None else None,
+            opts.glob,
+            opts.category,
+        )
+
+    checkpoint = None
+    if opts.checkpoint is not None:
+        checkpoint = Checkpoint(opts.checkpoint, opts.checkpoint_interval)
+
+    progress = None
+    if opts.progress or opts.progress_textfile is not None:
+        progress = ProgressReporter(
+            interval=opts.progress_interval,
+            stream=sys.stderr if opts.progress else None,
+            textfile=opts.progress_textfile,
+        )
+
+    cache = None
+    if opts.cache is not None:
+        cache = ResultCache(opts.cache, opts.cache_size << 20)
+
+    try:
+        result = validate(
+            dump,
+            opts.names or None,
+            glyphnames=glyphnames,
+            ignore_error=opts.ignore_error,
+            checkpoint=checkpoint,
+            resume=opts.resume,
+            dedup=not opts.no_dedup,
+            cache=cache,
+            validator_options=validator_options,
+            setup_workers=opts.setup_workers,
+            memory_report=memory_report,
+            progress=progress,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if opts.format == "v2":
+        write_v2(result, outpath)
+    else:
+        with outpath.open("w") as outfile:
+            json.dump(result, outfile, separators=(",", ":"), sort_keys=True)
+    if memory_report is not None:
+        memory_report.phase("write_result")
+        memory_report.write(opts.memory_report)
 
-    result = validate(dump, opts.names or None, ignore_error=opts.ignore_error)
+    if opts.store is not None:
+        with ResultStore(opts.store) as store:
+            store.add_run(result, dump.timestamp)
 
-    with outpath.open("w") as outfile:
-        json.dump(result, outfile, separators=(",", ":"), sort_keys=True)
+    if checkpoint is not None:
+        checkpoint.clear()
 
 
 if __name__ == "__main__":
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 import importlib.resources
+import io
 import json
+import mmap
 import re
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import quote
 from urllib.request import urlopen
 
 import yaml
 
+from gwv.packed import CJKSRC_MAGIC, PackedReader
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from gwv.packed import StringArray
+
 
 def range_inclusive(stt: int, end: int):
     return range(stt, end + 1)
@@ -192,6 +201,12 @@ def load_package_data(name: str) -> Any:
             return yaml.safe_load(f)
         if ext == ".txt":
             return f.read()
+        if ext == ".bin":
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, io.UnsupportedOperation):
+                # not a regular file (e.g. in a zip archive)
+                return f.read()
 
         raise ValueError(f"Unknown data file extension: {ext!r}")
 
@@ -225,18 +240,38 @@ class CJKSources:
     }
 
     def __init__(self):
-        self.data: dict[str, list[str | None]]
+        self._first_cp: int
+        self._cp2row: Sequence[int]
+        self._strings: StringArray
+        self._columns: list[Sequence[int]]
 
     def load(self):
-        self.data = load_package_data("data/3rd/cjksrc.json")
+        # The table is prebuilt by bdat/build_cjksrc.py and memory-mapped
+        reader = PackedReader(load_package_data("data/3rd/cjksrc.bin"), CJKSRC_MAGIC)
+        self._first_cp, n_columns = reader.read_uint32_array()
+        self._cp2row = reader.read_uint32_array()
+        self._strings = reader.read_string_array()
+        self._columns = [reader.read_uint32_array() for _ in range(n_columns)]
+
+    def get_by_codepoint(self, cp: int, column: int) -> str | None:
+        if not hasattr(self, "_columns"):
+            self.load()
+        cp_idx = cp - self._first_cp
+        if not 0 <= cp_idx < len(self._cp2row):
+            return None
+        row = self._cp2row[cp_idx]
+        if row == 0:
+            return None
+        string_id = self._columns[column][row - 1]
+        if string_id == 0:
+            return None
+        return self._strings[string_id - 1]
 
     def get(self, ucs: str, column: int) -> str | None:
-        if not hasattr(self, "data"):
-            self.load()
-        record = self.data.get(ucs)
-        if record is None:
+        cp = get_ucs_codepoint(ucs)
+        if cp is None or ucs != f"u{cp:04x}":
             return None
-        return record[column]
+        return self.get_by_codepoint(cp, column)
 
 
 cjk_sources = CJKSources()
@@ -0,0 +1,144 @@
+"""Parse glyph names of IDS (Ideographic Description Sequence).
+
+An IDS glyph name is a sequence of IDCs (u2ff0-u2fff, u31ef) and components
+joined by "-" in prefix notation, e.g. "u2ff0-u6c35-u2ff1-u4e00-u4e8c".
+A component is a UCS code point optionally followed by a variation selector
+("u4e00-ue0100") or a CDP code ("cdp-8c4e").
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import Literal, NamedTuple, Union
+
+IDC_ARITY = {
+    **{f"u2ff{c}": 2 for c in "01456789abcd"},
+    "u2ff2": 3,
+    "u2ff3": 3,
+    "u2ffe": 1,
+    "u2fff": 1,
+    "u31ef": 2,
+}
+
+_re_ucs = re.compile(r"u[23]?[\da-f]{4}")
+_re_vs = re.compile(r"u(?:e01[\da-f]{2}|fe0[\da-f])")
+_re_cdp = re.compile(r"cdp[on]?")
+_re_cdp_code = re.compile(r"[\da-f]{4}")
+
+# IDCs in the replaced representation of an IDS, by their arity
+_REPLACED_IDC = {1: "１", 2: "２", 3: "３"}
+_REPLACED_COMPONENT = "漢"
+
+
+class IDSToken(NamedTuple):
+    kind: Literal["idc", "component", "other"]
+    text: str
+    """The IDC, the code point or CDP code of the component, or the text of
+    something else"""
+    selector: str | None = None
+    """The variation selector following the code point of the component"""
+
+    @property
+    def name(self) -> str:
+        """The text of the token as it appears in the glyph name"""
+        if self.selector is not None:
+            return f"{self.text}-{self.selector}"
+        return self.text
+
+
+class IDSOperation(NamedTuple):
+    idc: str
+    operands: tuple[IDSNode, ...]
+
+
+IDSNode = Union[IDSToken, IDSOperation]
+
+
+class ParsedIDS(NamedTuple):
+    tokens: tuple[IDSToken, ...]
+    tree: IDSNode | None
+    """The operator/operand tree, or None if the IDS is invalid"""
+    replaced: str
+    """The IDS with IDCs replaced by their arities ("１", "２", "３") and
+    components by "漢", reduced as far as possible.  It is "漢" if and only if
+    the IDS is valid."""
+
+    @property
+    def is_valid(self) -> bool:
+        return self.tree is not None
+
+
+def tokenize_ids(name: str) -> list[IDSToken]:
+    parts = name.split("-")
+    tokens: list[IDSToken] = []
+    i = 0
+    while i < len(parts):
+        part = parts[i]
+        nxt = parts[i + 1] if i + 1 < len(parts) else None
+        if part in IDC_ARITY:
+            tokens.append(IDSToken("idc", part))
+        elif _re_ucs.fullmatch(part):
+            if nxt is not None and _re_vs.fullmatch(nxt):
+                tokens.append(IDSToken("component", part, nxt))
+                i += 1
+            else:
+                tokens.append(IDSToken("component", part))
+        elif (
+            nxt is not None and _re_cdp.fullmatch(part) and _re_cdp_code.fullmatch(nxt)
+        ):
+            tokens.append(IDSToken("component", f"{part}-{nxt}"))
+            i += 1
+        else:
+            tokens.append(IDSToken("other", part))
+        i += 1
+    return tokens
+
+
+def _is_node(item: IDSNode) -> bool:
+    return isinstance(item, IDSOperation) or item.kind == "component"
+
+
+def _replace(item: IDSNode) -> str:
+    if _is_node(item):
+        return _REPLACED_COMPONENT
+    assert isinstance(item, IDSToken)
+    if item.kind == "idc":
+        return _REPLACED_IDC[IDC_ARITY[item.text]]
+    return item.text
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def parse_ids(name: str) -> ParsedIDS:
+    """Parse an IDS in a single pass with a stack.
+
+    It is cached since the same name is parsed by several validators."""
+    tokens = tokenize_ids(name)
+    # The stack holds complete subtrees, IDCs awaiting their operands and
+    # tokens that are not part of an IDS.  Whenever an IDC is followed by as
+    # many complete subtrees as its arity, they are reduced into a subtree.
+    stack: list[IDSNode] = []
+    for token in tokens:
+        stack.append(token)
+        if token.kind != "component":
+            continue
+        while True:
+            n_operands = 0
+            while n_operands < min(len(stack), 4) and _is_node(stack[-1 - n_operands]):
+                n_operands += 1
+            if n_operands == len(stack):
+                break
+            idc = stack[-1 - n_operands]
+            if (
+                not isinstance(idc, IDSToken)
+                or idc.kind != "idc"
+                or IDC_ARITY[idc.text] != n_operands
+            ):
+                break
+            operands = tuple(stack[-n_operands:])
+            del stack[-1 - n_operands :]
+            stack.append(IDSOperation(idc.text, operands))
+
+    tree = stack[0] if len(stack) == 1 and _is_node(stack[0]) else None
+    replaced = "-".join(_replace(item) for item in stack)
+    return ParsedIDS(tuple(tokens), tree, replaced)
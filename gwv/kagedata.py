@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import cast
+from typing import TYPE_CHECKING, cast
+
+from gwv.partname import part_names
+
+if TYPE_CHECKING:
+    from gwv.partname import PartName
 
 _alias_prefix = "99:0:0:0:0:200:200:"
 _alias_prefix_len = len(_alias_prefix)
@@ -56,17 +61,38 @@ class KageData:
         )
 
 
-def _check_coords(coords: list[tuple[int | None, int | None]]):
+def _get_coords(data: tuple[int | None, ...]) -> tuple[tuple[int, int], ...] | None:
+    if data[0] == 99:
+        coords = ((data[3], data[4]), (data[5], data[6]))
+    else:
+        coords = tuple(zip(data[3::2], data[4::2]))
     if any(x is None or y is None for x, y in coords):
         return None
-    return cast("list[tuple[int, int]]", coords)
+    return cast("tuple[tuple[int, int], ...]", coords)
 
 
 class KageLine:
+    __slots__ = ("_coords", "_part", "data", "line_number", "strdata")
+
     def __init__(self, line_number: int, data: str):
         self.line_number = line_number
         self.strdata = data
         sdata = data.split(":")
+        # Fast path: convert all the fields at once.  kageInt is the same as
+        # int except for empty strings, so this gives the same result as the
+        # field-by-field conversion below whenever it does not raise.
+        try:
+            if sdata[0] == "99" and len(sdata) >= 8:
+                self.data = (99, *map(int, sdata[1:7]), None, *map(int, sdata[8:]))
+                self._part = part_names.get(sdata[7])
+                return
+            values = tuple(map(int, sdata))
+            if values[0] != 99:
+                self.data = values
+                return
+        except ValueError:
+            pass
+
         if kageIntSuppressError(sdata[0]) == 99:
             self.data = tuple(
                 [
@@ -75,7 +101,7 @@ class KageLine:
                 ]
             )
             if len(sdata) >= 8:
-                self._part_name = sdata[7]
+                self._part = part_names.get(sdata[7])
         else:
             self.data = tuple([kageIntSuppressError(x) for x in sdata])
 
@@ -92,19 +118,24 @@ class KageLine:
         return self.data[2]
 
     @property
-    def part_name(self) -> str:
+    def part(self) -> PartName:
+        """The parsed name of the quoted part, shared among all lines quoting it"""
         if self.stroke_type != 99:
             raise ValueError("tried to get part name of non-part KageLine")
-        return self._part_name
+        return self._part
 
     @property
-    def coords(self) -> list[tuple[int, int]] | None:
-        if self.stroke_type == 99:
-            return _check_coords(
-                [
-                    (self.data[3], self.data[4]),
-                    (self.data[5], self.data[6]),
-                ]
-            )
+    def part_name(self) -> str:
+        return self.part.name
 
-        return _check_coords(list(zip(self.data[3::2], self.data[4::2])))
+    @property
+    def coords(self) -> tuple[tuple[int, int], ...] | None:
+        """The control points of the stroke, or the bounding box of the part.
+
+        It is None if any of the coordinates is invalid."""
+        try:
+            return self._coords
+        except AttributeError:
+            pass
+        self._coords = coords = _get_coords(self.data)
+        return coords
@@ -0,0 +1,167 @@
+"""Memory usage report of a validation run.
+
+MemoryReport records the RSS and the memory traced by tracemalloc at the
+boundaries of the phases of a run (loading the dump, the setup of each
+validator, the validation loop, get_result and writing the result), with the
+allocation sites that grew the most in each phase, and attributes the memory
+retained after the validation loop to the dump, the shared tables of
+gwv.helper and, for each validator, its recorder, the other state of the
+instance and the data held by its module.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import tracemalloc
+import types
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gwv import helper
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Mapping
+
+    from gwv.dump import Dump
+    from gwv.validators import Validator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+N_TOP_SITES = 10
+
+# Code and types are shared by everything and not counted
+_SKIPPED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+)
+
+
+def deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """Return the total size of the objects reachable from obj that are not
+    in seen (ids of objects), adding them to seen."""
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return size
+
+
+def _module_state(module: types.ModuleType) -> list[Any]:
+    return [
+        value
+        for name, value in vars(module).items()
+        if not name.startswith("__") and not isinstance(value, _SKIPPED_TYPES)
+    ]
+
+
+def current_rss_kb() -> int | None:
+    """Return the current RSS of the process in kilobytes, or None if unknown."""
+    if resource is None:
+        return None
+    try:
+        with Path("/proc/self/statm").open() as f:
+            resident_pages = int(f.read().split()[1])
+    except OSError:  # not Linux
+        return None
+    return resident_pages * resource.getpagesize() // 1024
+
+
+def peak_rss_kb() -> int | None:
+    """Return the peak RSS of the process in kilobytes, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class MemoryReport:
+    """Memory usage at the phase boundaries of a run.
+
+    Tracing starts when the report is created, and slows the run down."""
+
+    def __init__(self):
+        self.phases: list[dict[str, Any]] = []
+        self.retained: dict[str, Any] = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._snapshot = self._take_snapshot()
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        # Leave out the snapshots themselves
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
+
+    def phase(self, name: str) -> None:
+        """Record the end of the phase."""
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = self._take_snapshot()
+        top = [
+            {
+                "file": stat.traceback[0].filename,
+                "size_kb": stat.size // 1024,
+                "diff_kb": stat.size_diff // 1024,
+            }
+            for stat in snapshot.compare_to(self._snapshot, "filename")[:N_TOP_SITES]
+            if stat.size_diff > 0
+        ]
+        self._snapshot = snapshot
+        tracemalloc.reset_peak()
+        self.phases.append(
+            {
+                "phase": name,
+                "rss_kb": current_rss_kb(),
+                "peak_rss_kb": peak_rss_kb(),
+                "traced_kb": traced // 1024,
+                "traced_peak_kb": traced_peak // 1024,
+                "top": top,
+            }
+        )
+
+    def attribute(self, dump: Dump, validators: Mapping[str, Validator]) -> None:
+        """Attribute the retained memory to the dump, the shared tables and
+        the validators.  Each object is counted once, for the first of them
+        that reaches it."""
+        seen: set[int] = {id(self)}
+        self.retained = {
+            "dump_kb": deep_sizeof(dump, seen) // 1024,
+            "helper_kb": deep_sizeof(_module_state(helper), seen) // 1024,
+            "validators": {},
+        }
+        for val_name, val in validators.items():
+            recorder_size = deep_sizeof(val.recorder, seen)
+            self.retained["validators"][val_name] = {
+                "recorder_kb": recorder_size // 1024,
+                "state_kb": deep_sizeof(val, seen) // 1024,
+                "module_kb": deep_sizeof(
+                    _module_state(sys.modules[type(val).__module__]), seen
+                )
+                // 1024,
+            }
+        # The peak of the phase should not include the ids in seen
+        del seen
+        tracemalloc.reset_peak()
+
+    def write(self, path: str | os.PathLike) -> None:
+        tracemalloc.stop()
+        with Path(path).open("w") as f:
+            json.dump({"phases": self.phases, "retained": self.retained}, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,122 @@
+"""Read and write compact binary tables that can be memory-mapped.
+
+A packed file consists of a magic string followed by a sequence of sections.
+Each section is an array of unsigned 32-bit little-endian integers preceded by
+its length, or a blob of bytes preceded by its length and padded to a multiple
+of 4 bytes.  An array of strings is stored as an array of offsets followed by
+a blob of the concatenated UTF-8 encoded strings.
+"""
+
+from __future__ import annotations
+
+import array
+import sys
+from typing import IO, TYPE_CHECKING, Union, overload
+
+if TYPE_CHECKING:
+    import mmap
+    from collections.abc import Iterable, Sequence
+
+    Buffer = Union[bytes, mmap.mmap]
+
+MJTABLE_MAGIC = b"GWVMJTB\x01"
+CJKSRC_MAGIC = b"GWVCJKS\x01"
+
+_UINT32 = "I"
+assert array.array(_UINT32).itemsize == 4
+
+
+def _uint32_array(values: Iterable[int]) -> array.array[int]:
+    arr = array.array(_UINT32, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+class PackedWriter:
+    def __init__(self, f: IO[bytes], magic: bytes):
+        assert len(magic) % 4 == 0
+        self._f = f
+        f.write(magic)
+
+    def write_uint32_array(self, values: Iterable[int]) -> None:
+        arr = _uint32_array(values)
+        self._f.write(_uint32_array([len(arr)]).tobytes())
+        self._f.write(arr.tobytes())
+
+    def write_bytes(self, data: bytes) -> None:
+        self._f.write(_uint32_array([len(data)]).tobytes())
+        self._f.write(data)
+        self._f.write(b"\0" * (-len(data) % 4))
+
+    def write_string_array(self, strings: Iterable[str]) -> None:
+        offsets = [0]
+        chunks: list[bytes] = []
+        for s in strings:
+            chunk = s.encode("utf-8")
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+        self.write_uint32_array(offsets)
+        self.write_bytes(b"".join(chunks))
+
+
+class StringArray:
+    """A read-only sequence of strings backed by a packed string array."""
+
+    def __init__(self, offsets: Sequence[int], blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StringArray index out of range")
+        stt = self._offsets[index]
+        end = self._offsets[index + 1]
+        return str(self._blob[stt:end], "utf-8")
+
+
+class PackedReader:
+    """Sequentially read the sections of a packed file without copying them."""
+
+    def __init__(self, buf: Buffer, magic: bytes):
+        self._view = memoryview(buf)
+        if self._view[: len(magic)] != magic:
+            raise ValueError("Unexpected file format or version")
+        self._pos = len(magic)
+
+    def _read_uint32(self) -> int:
+        view = self._view[self._pos : self._pos + 4]
+        self._pos += 4
+        return int.from_bytes(view, "little")
+
+    def read_uint32_array(self) -> Sequence[int]:
+        length = self._read_uint32()
+        view = self._view[self._pos : self._pos + length * 4]
+        self._pos += length * 4
+        if sys.byteorder != "little":
+            arr = array.array(_UINT32, view)
+            arr.byteswap()
+            return arr
+        return view.cast(_UINT32)
+
+    def read_bytes(self) -> memoryview:
+        length = self._read_uint32()
+        view = self._view[self._pos : self._pos + length]
+        self._pos += length + (-length % 4)
+        return view
+
+    def read_string_array(self) -> StringArray:
+        offsets = self.read_uint32_array()
+        blob = self.read_bytes()
+        return StringArray(offsets, blob)
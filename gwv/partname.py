@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import re
+import sys
+from typing import NamedTuple
+
+from gwv.helper import RE_REGIONS
+
+_re_suffix = re.compile(
+    r"(?:-(" + RE_REGIONS + r")(\d{2})?|-(\d{2}))?(?:-((?:var|itaiji)-\d{3}))?$"
+)
+
+
+class PartName(NamedTuple):
+    """A glyph name quoted as a part, split into its components.
+
+    For example, "u53e3-j04-var-001@3" is parsed into base "u53e3-j04-var-001",
+    version "3", region "j", henka "04" and variant "var-001"."""
+
+    name: str
+    base: str
+    version: str | None
+    """The version number after "@", or None if the latest version is quoted"""
+    henka: str | None
+    """偏化変形接尾コード"""
+    variant: str | None
+    region: str | None
+
+
+def parse_part_name(name: str) -> PartName:
+    base, at, version = name.partition("@")
+    m = _re_suffix.search(base)
+    assert m is not None  # the pattern matches the empty string at the end
+    region, region_henka, henka, variant = m.groups()
+    return PartName(
+        name=name,
+        base=base,
+        version=version if at else None,
+        henka=region_henka or henka,
+        variant=variant,
+        region=region,
+    )
+
+
+class PartNameTable:
+    """Interned table of parsed part names.
+
+    Each distinct part name is parsed only once, and every KAGE line quoting it
+    shares the same PartName entry."""
+
+    def __init__(self):
+        self._entries: dict[str, PartName] = {}
+
+    def get(self, name: str) -> PartName:
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = parse_part_name(sys.intern(name))
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+part_names = PartNameTable()
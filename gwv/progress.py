@@ -0,0 +1,150 @@
+"""Progress report of the validation loop.
+
+ProgressReporter prints the number of glyphs validated, the throughput and
+the estimated time remaining, and can export them with the time taken by
+each validator as a Prometheus text file (for the textfile collector of the
+node exporter), rewritten atomically.
+
+To keep the overhead negligible, the clock is read only once every
+sample_interval glyphs, and the validators are timed only on those glyphs;
+their cumulative times are estimated from the samples.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressReporter:
+    def __init__(
+        self,
+        *,
+        interval: float = 5.0,
+        sample_interval: int = 64,
+        stream: IO[str] | None = sys.stderr,
+        textfile: str | os.PathLike | None = None,
+    ):
+        self.interval = interval
+        self.sample_interval = sample_interval
+        self.stream = stream
+        self.textfile = Path(textfile) if textfile is not None else None
+        self.total = 0
+        self.done = 0
+        self.validator_times: dict[str, float] = {}
+        self._start = self._last_report = 0.0
+
+    def start(self, total: int, validator_names: Sequence[str]) -> None:
+        self.total = total
+        self.done = 0
+        self.validator_times = dict.fromkeys(validator_names, 0.0)
+        self._start = self._last_report = time.monotonic()
+        self._write_textfile()
+
+    def is_sampled(self, i: int) -> bool:
+        """Return whether the validators are to be timed on the i-th glyph."""
+        return i % self.sample_interval == 0
+
+    def add_sample(self, val_name: str, seconds: float) -> None:
+        self.validator_times[val_name] += seconds * self.sample_interval
+
+    def update(self, done: int) -> None:
+        """Notify that the first done glyphs have been validated."""
+        self.done = done
+        if done % self.sample_interval != 0:
+            return
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._report()
+
+    def finish(self) -> None:
+        self._report()
+        if self.stream is not None:
+            slowest = sorted(
+                self.validator_times.items(), key=lambda item: item[1], reverse=True
+            )
+            self.stream.write(
+                "gwv: estimated time per validator: "
+                + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in slowest)
+                + "\n"
+            )
+            self.stream.flush()
+
+    @property
+    def rate(self) -> float:
+        """Glyphs validated per second"""
+        elapsed = time.monotonic() - self._start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def _eta(self, rate: float) -> float | None:
+        if rate <= 0:
+            return None
+        return (self.total - self.done) / rate
+
+    def _report(self) -> None:
+        rate = self.rate
+        eta = self._eta(rate)
+        if self.stream is not None:
+            percent = self.done / self.total * 100 if self.total else 100.0
+            self.stream.write(
+                f"gwv: {self.done}/{self.total} glyphs ({percent:.1f}%), "
+                f"{rate:.0f} glyphs/s, ETA "
+                + (_format_duration(eta) if eta is not None else "-")
+                + "\n"
+            )
+            self.stream.flush()
+        self._write_textfile()
+
+    def _write_textfile(self) -> None:
+        if self.textfile is None:
+            return
+        rate = self.rate
+        eta = self._eta(rate)
+        lines = [
+            "# HELP gwv_glyphs_validated_total Glyphs validated so far.",
+            "# TYPE gwv_glyphs_validated_total counter",
+            f"gwv_glyphs_validated_total {self.done}",
+            "# HELP gwv_glyphs Glyphs to be validated in the run.",
+            "# TYPE gwv_glyphs gauge",
+            f"gwv_glyphs {self.total}",
+            "# HELP gwv_glyphs_per_second Glyphs validated per second.",
+            "# TYPE gwv_glyphs_per_second gauge",
+            f"gwv_glyphs_per_second {rate:.3f}",
+        ]
+        if eta is not None:
+            lines += [
+                "# HELP gwv_eta_seconds Estimated seconds until the run ends.",
+                "# TYPE gwv_eta_seconds gauge",
+                f"gwv_eta_seconds {eta:.1f}",
+            ]
+        lines += [
+            "# HELP gwv_validator_seconds_total Estimated time spent in each "
+            "validator.",
+            "# TYPE gwv_validator_seconds_total counter",
+        ]
+        lines += [
+            f'gwv_validator_seconds_total{{validator="{name}"}} {seconds:.3f}'
+            for name, seconds in self.validator_times.items()
+        ]
+        lines += [
+            "# HELP gwv_progress_updated_seconds Time of the last update.",
+            "# TYPE gwv_progress_updated_seconds gauge",
+            f"gwv_progress_updated_seconds {time.time():.3f}",
+        ]
+        # Replace the file at once so that the collector never reads half of it
+        tmp = self.textfile.with_name(self.textfile.name + f".{os.getpid()}.tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        tmp.replace(self.textfile)
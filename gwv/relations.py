@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from gwv.helper import RE_REGIONS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_re_var_nnn_henka = re.compile(r"(.+)-(?:(?:var|itaiji)-\d{3}|\d{2})")
+_re_var_src_henka = re.compile(r"(u[0-9a-f]{4,5}-" + RE_REGIONS + r")\d{2}")
+_re_var_other = re.compile(r"(u[0-9a-f]{4,5}|cdp[on]?-[0-9a-f]{4})-.+")
+
+_re_ucs = re.compile(r"(u[\da-f]{4,6})(?:-(.+))?")
+_re_region = re.compile(RE_REGIONS)
+_re_ids = re.compile(r"(?:u2ff[\da-f]|u31ef)-.+")
+_re_koseki = re.compile(r"koseki-(\d{6})")
+_re_toki = re.compile(r"toki-00(\d{6})")
+
+
+def get_base_name(name: str) -> str | None:
+    """Return the name of the glyph that the glyph is derived from, e.g.
+    "u4e00" for "u4e00-var-001", "u4e00-j" for "u4e00-j01"."""
+    m = (
+        _re_var_nnn_henka.fullmatch(name)
+        or _re_var_src_henka.fullmatch(name)
+        or _re_var_other.fullmatch(name)
+    )
+    return m.group(1) if m else None
+
+
+class GlyphRelations:
+    """Relationships between the glyphs in a dump derived from their names.
+
+    It is built in a single pass over the glyph names, without looking at the
+    glyph data."""
+
+    def __init__(self, names: Iterable[str]):
+        names = set(names)
+
+        self.base: dict[str, str] = {}
+        """Name of the glyph each glyph is derived from (see get_base_name),
+        whether or not it exists"""
+        self.children: dict[str, list[str]] = {}
+        """Names of the glyphs derived from each glyph"""
+        self.nomark: dict[str, str] = {}
+        """Name of the existing nomark glyph (uxxxx) of each UCS glyph"""
+        self.regional: dict[str, dict[str, str]] = {}
+        """Regional glyphs of each code point, e.g.
+        regional["u4e00"]["jv"] == "u4e00-jv" """
+        self.koseki_of_toki: dict[str, str] = {}
+        """Name of the koseki glyph corresponding to each toki-00xxxxxx glyph,
+        whether or not it exists"""
+        self.toki_of_koseki: dict[str, str] = {}
+        """Name of the existing toki-00xxxxxx glyph of each koseki glyph"""
+
+        for name in names:
+            base = get_base_name(name)
+            if base is not None:
+                self.base[name] = base
+                self.children.setdefault(base, []).append(name)
+
+            if (m := _re_ucs.fullmatch(name)) and not _re_ids.fullmatch(name):
+                nomark, tail = m.groups()
+                if tail is not None and nomark in names:
+                    self.nomark[name] = nomark
+                if tail is not None and _re_region.fullmatch(tail):
+                    self.regional.setdefault(nomark, {})[tail] = name
+            elif m := _re_toki.fullmatch(name):
+                koseki = "koseki-" + m.group(1)
+                self.koseki_of_toki[name] = koseki
+                if koseki in names:
+                    self.toki_of_koseki[koseki] = name
+
+        for children in self.children.values():
+            children.sort()
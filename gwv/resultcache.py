@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gwv import (
+    __version__,
+    filters,
+    helper,
+    kagedata,
+    partname,
+    validatorctx,
+    validators,
+)
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Hashable
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    errors TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Modules whose changes may affect the results of any validator
+_common_modules = [filters, helper, kagedata, partname, validatorctx, validators]
+
+_BATCH_SIZE = 10000
+
+
+def get_code_version(val: validators.Validator) -> str:
+    """Return a hash of the source code that the results of the validator
+    depend on."""
+    h = hashlib.blake2b(__version__.encode(), digest_size=16)
+    for module in [sys.modules[type(val).__module__], *_common_modules]:
+        if module.__file__ is not None:
+            h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """Persistent cache of the errors found by content-local validators.
+
+    An entry is keyed by the validator name, the version of its code, the gdata
+    of the glyph and the content key (the external input that the validator
+    declares it depends on).  Entries that have not been used for the most
+    runs are evicted when the total size of the errors exceeds max_size bytes.
+    """
+
+    def __init__(self, path: str | os.PathLike, max_size: int = 1 << 30):
+        self.path = Path(path)
+        self.max_size = max_size
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'run'").fetchone()
+        self._run = (row[0] if row else 0) + 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('run', ?)",
+            (self._run,),
+        )
+        self._conn.commit()
+
+        self._versions: dict[str, str] = {}
+        self._pending_hits: list[bytes] = []
+        self._pending_puts: list[tuple[bytes, str, int]] = []
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def _key(
+        self,
+        val_name: str,
+        val: validators.Validator,
+        gdata: str,
+        content_key: Hashable,
+    ) -> bytes:
+        version = self._versions.get(val_name)
+        if version is None:
+            version = self._versions[val_name] = get_code_version(val)
+        h = hashlib.blake2b(digest_size=16)
+        for part in (val_name, version, repr(content_key), gdata):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.digest()
+
+    def get(
+        self,
+        val_name: str,
+        val: validators.Validator,
+        gdata: str,
+        content_key: Hashable,
+    ) -> list[tuple[str, list[Any]]] | None:
+        key = self._key(val_name, val, gdata, content_key)
+        row = self._conn.execute(
+            "SELECT errors FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.n_misses += 1
+            return None
+        self.n_hits += 1
+        self._pending_hits.append(key)
+        if len(self._pending_hits) >= _BATCH_SIZE:
+            self._flush()
+        return [(errcode, params) for errcode, params in json.loads(row[0])]
+
+    def put(
+        self,
+        val_name: str,
+        val: validators.Validator,
+        gdata: str,
+        content_key: Hashable,
+        errors: list[tuple[str, Any]],
+    ) -> None:
+        key = self._key(val_name, val, gdata, content_key)
+        serialized = json.dumps(
+            [
+                [errcode, [validators.param_to_serializable(p) for p in param]]
+                for errcode, param in errors
+            ],
+            separators=(",", ":"),
+        )
+        self._pending_puts.append((key, serialized, self._run))
+        if len(self._pending_puts) >= _BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE results SET last_used = ? WHERE key = ?",
+                [(self._run, key) for key in self._pending_hits],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, errors, last_used) "
+                "VALUES (?, ?, ?)",
+                self._pending_puts,
+            )
+        self._pending_hits.clear()
+        self._pending_puts.clear()
+
+    def _evict(self) -> None:
+        (size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(key) + LENGTH(errors)), 0) FROM results"
+        ).fetchone()
+        if size <= self.max_size:
+            return
+        evicted: list[tuple[bytes]] = []
+        rows = self._conn.execute(
+            "SELECT key, LENGTH(key) + LENGTH(errors) FROM results ORDER BY last_used"
+        )
+        for key, row_size in rows:
+            if size <= self.max_size:
+                break
+            evicted.append((key,))
+            size -= row_size
+        rows.close()
+        with self._conn:
+            self._conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+        # Give the freed pages back to the file system
+        self._conn.execute("VACUUM")
+        log.info("Evicted %d entries from the result cache", len(evicted))
+
+    def close(self) -> None:
+        self._flush()
+        self._evict()
+        self._conn.close()
+        log.info("Result cache: %d hits, %d misses", self.n_hits, self.n_misses)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,127 @@
+"""Compare the results of two validation runs.
+
+The results are read one error code at a time (see
+gwv.resultformat.iter_result_groups) and merged on the sorted (validator,
+error code, glyph name) keys, so only the rows of one error code of each run
+are held in memory.  The memory use is therefore not constant: it grows with
+the largest error code, which on a full dump can hold most of the rows of a
+result.  Rows cannot be merged as a stream because they are not sorted by
+glyph name within an error code, and a v2 shard is a single compressed JSON
+array.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from gwv.resultformat import iter_result_groups
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Iterator, Sequence
+
+
+def _group_by_glyph(rows: Iterable[list]) -> dict[str, list[list]]:
+    grouped: dict[str, list[list]] = {}
+    for glyphname, *params in rows:
+        grouped.setdefault(glyphname, []).append(params)
+    return grouped
+
+
+def _canonical(params_list: list[list]) -> list[str]:
+    # Tuples and lists are both JSON arrays
+    return sorted(json.dumps(params, sort_keys=True) for params in params_list)
+
+
+def _diff_group(
+    val_name: str, errcode: str, old_rows: list[list], new_rows: list[list]
+) -> Iterator[dict[str, Any]]:
+    old = _group_by_glyph(old_rows)
+    new = _group_by_glyph(new_rows)
+    for glyphname in sorted(old.keys() | new.keys()):
+        record: dict[str, Any] = {
+            "validator": val_name,
+            "errcode": errcode,
+            "glyph": glyphname,
+        }
+        if glyphname not in old:
+            record["status"] = "added"
+            record["new"] = new[glyphname]
+        elif glyphname not in new:
+            record["status"] = "removed"
+            record["old"] = old[glyphname]
+        elif _canonical(old[glyphname]) != _canonical(new[glyphname]):
+            record["status"] = "changed"
+            record["old"] = old[glyphname]
+            record["new"] = new[glyphname]
+        else:
+            continue
+        yield record
+
+
+def _group_key(group: tuple[str, str, str, list[list]]) -> tuple[str, str]:
+    return group[0], group[1]
+
+
+def diff_results(
+    old_path: str | os.PathLike, new_path: str | os.PathLike
+) -> Iterator[dict[str, Any]]:
+    """Yield the differences between two results, ordered by validator name,
+    error code and glyph name.
+
+    Each record has the "validator", "errcode" and "glyph" keys and a "status"
+    of "added" (flagged only in the new result), "removed" (only in the old
+    one) or "changed" (the parameters differ).  "old" and "new" hold the
+    parameters of the rows of the glyph in the respective results."""
+    merged = heapq.merge(
+        (
+            (val_name, errcode, "old", rows)
+            for val_name, errcode, rows in iter_result_groups(old_path)
+        ),
+        (
+            (val_name, errcode, "new", rows)
+            for val_name, errcode, rows in iter_result_groups(new_path)
+        ),
+        key=_group_key,
+    )
+    for (val_name, errcode), groups in itertools.groupby(merged, key=_group_key):
+        rows = {side: side_rows for _val_name, _errcode, side, side_rows in groups}
+        yield from _diff_group(
+            val_name, errcode, rows.get("old", []), rows.get("new", [])
+        )
+
+
+def main(args: Sequence[str] | None = None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        prog="gwv-diff",
+        description="Compare two validation results and write the newly flagged, "
+        "fixed and changed glyphs as JSON lines",
+    )
+    parser.add_argument("old", type=Path, help="Result of the earlier run")
+    parser.add_argument("new", type=Path, help="Result of the later run")
+    parser.add_argument(
+        "-o", "--out", help="File to write to (default: standard output)", type=Path
+    )
+    opts = parser.parse_args(args)
+
+    outfile = sys.stdout if opts.out is None else opts.out.open("w")
+    try:
+        for record in diff_results(opts.old, opts.new):
+            outfile.write(json.dumps(record, separators=(",", ":"), sort_keys=True))
+            outfile.write("\n")
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Read and write the compact (v2) layout of validation results.
+
+The v1 layout is a single JSON file mapping each validator name to its
+timestamp and result, where a result maps each error code to a list of rows
+of the glyph name followed by the parameters of the error.
+
+The v2 layout is a directory containing:
+
+- manifest.json: the format version and, for each validator, its timestamp,
+  the numbers of errors (and the exact totals of bounded results), and the
+  shard file of each error code
+- strings.json.gz: the table of all strings found in the rows
+- <validator>/<errcode>.json.gz: a shard holding the rows of an error code
+
+In a shard, the strings in the rows are replaced by their indices in the
+string table.  "kinds" tells how each position of the rows is encoded:
+"str" for a string, "line" for a [line number, KAGE line] pair, and "raw"
+for a value stored as is.  Positions beyond the end of kinds use its last
+element.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+FORMAT_VERSION = 2
+
+MANIFEST_NAME = "manifest.json"
+STRINGS_NAME = "strings.json.gz"
+
+
+def _kind_of(value: Any) -> str:
+    if isinstance(value, str):
+        return "str"
+    if (
+        isinstance(value, (list, tuple))
+        and len(value) == 2
+        and type(value[0]) is int
+        and isinstance(value[1], str)
+    ):
+        return "line"
+    return "raw"
+
+
+def _get_kinds(rows: Iterable[Sequence[Any]]) -> list[str]:
+    kinds: list[str] = []
+    for row in rows:
+        for i, value in enumerate(row):
+            if i == len(kinds):
+                kinds.append(_kind_of(value))
+            elif kinds[i] != "raw" and kinds[i] != _kind_of(value):
+                kinds[i] = "raw"
+    while len(kinds) > 1 and kinds[-1] == kinds[-2]:
+        kinds.pop()
+    return kinds
+
+
+def _decode(value: Any, kind: str, strings: Sequence[str]) -> Any:
+    if kind == "str":
+        return strings[value]
+    if kind == "line":
+        return [value[0], strings[value[1]]]
+    return value
+
+
+def _write_json_gz(path: Path, obj: Any) -> None:
+    data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    with path.open("wb") as f:
+        # mtime=0 makes the output reproducible
+        with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=6, mtime=0) as gz:
+            gz.write(data)
+
+
+def _read_json_gz(path: Path) -> Any:
+    with gzip.open(path, "rb") as gz:
+        return json.load(gz)
+
+
+def write_v2(result: dict[str, dict[str, Any]], outdir: str | os.PathLike) -> None:
+    """Write the result returned by gwv.validator.validate in the v2 layout."""
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    string_table: list[str] = []
+    string_ids: dict[str, int] = {}
+
+    def encode_str(s: str) -> int:
+        i = string_ids.get(s)
+        if i is None:
+            i = string_ids[s] = len(string_table)
+            string_table.append(s)
+        return i
+
+    encoders: dict[str, Callable[[Any], Any]] = {
+        "str": encode_str,
+        "line": lambda line: [line[0], encode_str(line[1])],
+        "raw": lambda value: value,
+    }
+
+    manifest: dict[str, Any] = {"version": FORMAT_VERSION, "validators": {}}
+    for val_name, val_result in result.items():
+        (outdir / val_name).mkdir(exist_ok=True)
+        errcodes: dict[str, dict[str, Any]] = {}
+        for errcode, rows in val_result["result"].items():
+            kinds = _get_kinds(rows)
+            row_encoders = [encoders[kind] for kind in kinds]
+            encoded = []
+            for row in rows:
+                if len(row) > len(row_encoders):
+                    row_encoders += [row_encoders[-1]] * (len(row) - len(row_encoders))
+                encoded.append([enc(value) for enc, value in zip(row_encoders, row)])
+            shard = f"{val_name}/{errcode}.json.gz"
+            _write_json_gz(outdir / shard, {"kinds": kinds, "rows": encoded})
+            errcodes[errcode] = {"count": len(rows), "file": shard}
+        val_manifest: dict[str, Any] = {
+            "timestamp": val_result["timestamp"],
+            "errcodes": errcodes,
+        }
+        if "total" in val_result:
+            val_manifest["total"] = val_result["total"]
+        manifest["validators"][val_name] = val_manifest
+    _write_json_gz(outdir / STRINGS_NAME, string_table)
+
+    with (outdir / MANIFEST_NAME).open("w") as f:
+        json.dump(manifest, f, separators=(",", ":"), sort_keys=True)
+
+
+def _read_manifest(indir: Path) -> dict[str, Any]:
+    with (indir / MANIFEST_NAME).open() as f:
+        manifest: dict[str, Any] = json.load(f)
+    if manifest.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result version: {manifest.get('version')!r}")
+    return manifest
+
+
+def _read_shard(path: Path, strings: Sequence[str]) -> list[list]:
+    shard = _read_json_gz(path)
+    kinds: list[str] = shard["kinds"]
+    rows: list[list] = []
+    for row in shard["rows"]:
+        if len(row) > len(kinds):
+            kinds = kinds + [kinds[-1]] * (len(row) - len(kinds))
+        rows.append([_decode(value, kind, strings) for kind, value in zip(kinds, row)])
+    return rows
+
+
+def read_v2(indir: str | os.PathLike) -> dict[str, dict[str, Any]]:
+    """Read a result in the v2 layout and return it in the v1 layout."""
+    indir = Path(indir)
+    manifest = _read_manifest(indir)
+    strings: list[str] = _read_json_gz(indir / STRINGS_NAME)
+
+    result: dict[str, dict[str, Any]] = {}
+    for val_name, val_manifest in manifest["validators"].items():
+        val_result = {
+            errcode: _read_shard(indir / shard_info["file"], strings)
+            for errcode, shard_info in val_manifest["errcodes"].items()
+        }
+        result[val_name] = {
+            "timestamp": val_manifest["timestamp"],
+            "result": val_result,
+        }
+        if "total" in val_manifest:
+            result[val_name]["total"] = val_manifest["total"]
+    return result
+
+
+class _JSONStreamReader:
+    """Incrementally read the values of a JSON text from a file object."""
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 16):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at the end)."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\n\r":
+                pos += 1
+            self._pos = pos
+            if pos < len(buf) or not self._fill():
+                return buf[pos : pos + 1]
+
+    def expect(self, chars: str) -> str:
+        c = self.peek()
+        if not c or c not in chars:
+            raise ValueError(f"Expected one of {chars!r} but got {c!r}")
+        self._pos += 1
+        return c
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if (
+                end < len(self._buf) and self._buf[end] not in "0123456789.eE+-"
+            ) or not self._fill():
+                self._pos = end
+                return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of an object.  The caller must consume the
+        value of each key before advancing the iterator."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def iter_array(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def _iter_v1_groups(path: Path) -> Iterator[tuple[str, str, list[list]]]:
+    with path.open() as f:
+        reader = _JSONStreamReader(f)
+        for val_name in reader.iter_object():
+            for key in reader.iter_object():
+                if key != "result":
+                    reader.value()
+                    continue
+                for errcode in reader.iter_object():
+                    yield val_name, errcode, list(reader.iter_array())
+
+
+def _iter_v2_groups(indir: Path) -> Iterator[tuple[str, str, list[list]]]:
+    manifest = _read_manifest(indir)
+    strings: list[str] = _read_json_gz(indir / STRINGS_NAME)
+    for val_name, val_manifest in sorted(manifest["validators"].items()):
+        for errcode, shard_info in sorted(val_manifest["errcodes"].items()):
+            yield val_name, errcode, _read_shard(indir / shard_info["file"], strings)
+
+
+def iter_result_groups(
+    path: str | os.PathLike,
+) -> Iterator[tuple[str, str, list[list]]]:
+    """Iterate over the (validator name, error code, rows) of a result in either
+    layout (a v2 result is a directory) without loading all of it at once.
+
+    The groups are sorted by the validator name and the error code, which
+    holds for v1 files written with sort_keys as gwv does; a ValueError is
+    raised otherwise."""
+    path = Path(path)
+    groups = _iter_v2_groups(path) if path.is_dir() else _iter_v1_groups(path)
+    last_key: tuple[str, str] | None = None
+    for val_name, errcode, rows in groups:
+        if last_key is not None and (val_name, errcode) <= last_key:
+            raise ValueError(f"{path} is not sorted by validator and error code")
+        last_key = (val_name, errcode)
+        yield val_name, errcode, rows
+
+
+def main(args: Sequence[str] | None = None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Convert a v2 (compact) validation result to the v1 JSON file"
+    )
+    parser.add_argument("indir", type=Path, help="Directory of the v2 result")
+    parser.add_argument("outfile", type=Path, help="JSON file to write to")
+    opts = parser.parse_args(args)
+
+    result = read_v2(opts.indir)
+    with opts.outfile.open("w") as outfile:
+        json.dump(result, outfile, separators=(",", ":"), sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
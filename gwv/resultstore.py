@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    dump_timestamp REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validators (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS errcodes (
+    id INTEGER PRIMARY KEY,
+    validator_id INTEGER NOT NULL REFERENCES validators (id),
+    errcode TEXT NOT NULL,
+    UNIQUE (validator_id, errcode)
+);
+CREATE TABLE IF NOT EXISTS glyphs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS errors (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    errcode_id INTEGER NOT NULL REFERENCES errcodes (id),
+    glyph_id INTEGER NOT NULL REFERENCES glyphs (id),
+    params TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS errors_errcode ON errors (errcode_id, run_id, glyph_id);
+CREATE INDEX IF NOT EXISTS errors_glyph ON errors (glyph_id);
+CREATE TABLE IF NOT EXISTS counts (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    errcode_id INTEGER NOT NULL REFERENCES errcodes (id),
+    count INTEGER NOT NULL,
+    PRIMARY KEY (errcode_id, run_id)
+) WITHOUT ROWID;
+"""
+
+_BATCH_SIZE = 10000
+
+
+class ResultStore:
+    """SQLite database accumulating the results of validation runs.
+
+    Each run adds its errors, one row per error with the parameters encoded
+    in JSON, and the number of errors of each error code (the exact total if
+    the validator kept only some of them), so that the history of the counts
+    can be queried without scanning the errors.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def _get_ids(self, table: str, names: set[str]) -> dict[str, int]:
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (name) VALUES (?)",
+            [(name,) for name in names],
+        )
+        return dict(self._conn.execute(f"SELECT name, id FROM {table}"))
+
+    def _get_errcode_id(self, validator_id: int, errcode: str) -> int:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO errcodes (validator_id, errcode) VALUES (?, ?)",
+            (validator_id, errcode),
+        )
+        (errcode_id,) = self._conn.execute(
+            "SELECT id FROM errcodes WHERE validator_id = ? AND errcode = ?",
+            (validator_id, errcode),
+        ).fetchone()
+        return errcode_id
+
+    def add_run(self, result: dict[str, dict[str, Any]], dump_timestamp: float) -> int:
+        """Add the result returned by gwv.validator.validate as a new run and
+        return the id of the run."""
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs (dump_timestamp, created_at) VALUES (?, ?)",
+                (dump_timestamp, time.time()),
+            )
+            run_id = cur.lastrowid
+            assert run_id is not None
+            validator_ids = self._get_ids("validators", set(result))
+            glyph_ids = self._get_ids(
+                "glyphs",
+                {
+                    row[0]
+                    for val_result in result.values()
+                    for rows in val_result["result"].values()
+                    for row in rows
+                },
+            )
+            n_errors = 0
+            for val_name, val_result in result.items():
+                totals: dict[str, int] = val_result.get("total", {})
+                for errcode, rows in val_result["result"].items():
+                    errcode_id = self._get_errcode_id(validator_ids[val_name], errcode)
+                    self._conn.execute(
+                        "INSERT INTO counts (run_id, errcode_id, count) "
+                        "VALUES (?, ?, ?)",
+                        (run_id, errcode_id, totals.get(errcode, len(rows))),
+                    )
+                    for stt in range(0, len(rows), _BATCH_SIZE):
+                        self._conn.executemany(
+                            "INSERT INTO errors (run_id, errcode_id, glyph_id, params) "
+                            "VALUES (?, ?, ?, ?)",
+                            [
+                                (
+                                    run_id,
+                                    errcode_id,
+                                    glyph_ids[row[0]],
+                                    json.dumps(row[1:], separators=(",", ":")),
+                                )
+                                for row in rows[stt : stt + _BATCH_SIZE]
+                            ],
+                        )
+                    n_errors += len(rows)
+        log.info("Stored %d errors as run %d in %s", n_errors, run_id, self.path)
+        return run_id
+
+    def get_last_run_id(self) -> int | None:
+        row = self._conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def get_errors(
+        self,
+        val_name: str,
+        errcode: str,
+        *,
+        run_id: int | None = None,
+        start: str | None = None,
+        stop: str | None = None,
+    ) -> list[list]:
+        """Return the rows of an error code in a run (the last run if run_id is
+        None) for the glyphs whose names are in the range [start, stop),
+        ordered by the glyph name."""
+        if run_id is None:
+            run_id = self.get_last_run_id()
+        query = (
+            "SELECT glyphs.name, errors.params FROM errors "
+            "JOIN errcodes ON errcodes.id = errors.errcode_id "
+            "JOIN validators ON validators.id = errcodes.validator_id "
+            "JOIN glyphs ON glyphs.id = errors.glyph_id "
+            "WHERE validators.name = ? AND errcodes.errcode = ? AND errors.run_id = ?"
+        )
+        params: list[Any] = [val_name, errcode, run_id]
+        if start is not None:
+            query += " AND glyphs.name >= ?"
+            params.append(start)
+        if stop is not None:
+            query += " AND glyphs.name < ?"
+            params.append(stop)
+        query += " ORDER BY glyphs.name"
+        return [
+            [glyphname, *json.loads(row_params)]
+            for glyphname, row_params in self._conn.execute(query, params)
+        ]
+
+    def get_count_history(
+        self, val_name: str, errcode: str | None = None
+    ) -> list[tuple[int, float, int]]:
+        """Return (run id, dump timestamp, number of errors) of each run for an
+        error code, or for all error codes of the validator if errcode is None."""
+        query = (
+            "SELECT runs.id, runs.dump_timestamp, SUM(counts.count) FROM counts "
+            "JOIN errcodes ON errcodes.id = counts.errcode_id "
+            "JOIN validators ON validators.id = errcodes.validator_id "
+            "JOIN runs ON runs.id = counts.run_id "
+            "WHERE validators.name = ?"
+        )
+        params: list[Any] = [val_name]
+        if errcode is not None:
+            query += " AND errcodes.errcode = ?"
+            params.append(errcode)
+        query += " GROUP BY runs.id ORDER BY runs.id"
+        return list(self._conn.execute(query, params))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
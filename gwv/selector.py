@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import fnmatch
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, get_args
+
+from gwv.helper import CategoryType, categorize
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Collection, Iterable
+
+    from gwv.dump import Dump
+
+log = logging.getLogger(__name__)
+
+all_categories: tuple[CategoryType, ...] = get_args(CategoryType)
+
+
+def read_glyph_list(filepath: str | os.PathLike) -> list[str]:
+    """Read glyph names from a file, one per line.
+
+    Blank lines and lines starting with "#" are ignored."""
+    with Path(filepath).open() as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def select_glyphs(
+    dump: Dump,
+    names: Iterable[str] | None = None,
+    patterns: Iterable[str] | None = None,
+    categories: Collection[str] | None = None,
+) -> list[str]:
+    """Return the names of the glyphs in the dump that match all the selectors.
+
+    names is a list of glyph names, patterns is a list of shell-style wildcard
+    patterns of which any should match, and categories is a collection of
+    category names (see helper.categorize) of which any should match.
+    A selector that is None does not filter out anything."""
+    if names is not None:
+        selected = []
+        for name in names:
+            if name in dump:
+                selected.append(name)
+            else:
+                log.warning("Glyph %s is not found in the dump", name)
+    else:
+        selected = list(dump.keys())
+
+    if patterns is not None:
+        regex = re.compile("|".join(fnmatch.translate(pat) for pat in patterns))
+        selected = [name for name in selected if regex.match(name)]
+
+    if categories is not None:
+        unknown = set(categories).difference(all_categories)
+        if unknown:
+            raise ValueError(f"Unknown categories: {', '.join(sorted(unknown))}")
+        selected = [name for name in selected if categorize(name)[0] in categories]
+
+    return selected
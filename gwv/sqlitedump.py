@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+import sys
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from gwv.dump import Dump
+from gwv.kagedata import KageData, get_entity_name
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Sequence
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE meta (
+    name TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE glyphs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    related TEXT NOT NULL,
+    gdata TEXT NOT NULL,
+    entity TEXT
+);
+CREATE TABLE quotes (
+    part TEXT NOT NULL,
+    glyph_id INTEGER NOT NULL REFERENCES glyphs (id),
+    PRIMARY KEY (part, glyph_id)
+) WITHOUT ROWID;
+"""
+
+_INDEXES = """
+CREATE INDEX glyphs_related ON glyphs (related);
+CREATE INDEX glyphs_entity ON glyphs (entity);
+"""
+
+
+class _GlyphTable(Mapping[str, tuple[str, str]]):
+    """Read-only mapping of glyph names to (related, gdata) in a database.
+
+    It iterates over the glyph names in the order of the dump file."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getitem__(self, glyphname: str) -> tuple[str, str]:
+        row = self._conn.execute(
+            "SELECT related, gdata FROM glyphs WHERE name = ?", (glyphname,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(glyphname)
+        return row
+
+    def __contains__(self, glyphname: object) -> bool:
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM glyphs WHERE name = ?", (glyphname,)
+            ).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for (name,) in self._conn.execute("SELECT name FROM glyphs ORDER BY id"):
+            yield name
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM glyphs").fetchone()
+        return count
+
+
+class SQLiteDump(Dump):
+    """Dump stored in a SQLite database made by SQLiteDump.create.
+
+    Besides the interface of Dump, it can look up the glyphs by their related
+    glyph, by their entity and by the parts they quote using indexes."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        (timestamp,) = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'timestamp'"
+        ).fetchone()
+        super().__init__(_GlyphTable(self._conn), timestamp)
+
+    @classmethod
+    def create(
+        cls, path: str | os.PathLike, dump_path: str | os.PathLike
+    ) -> SQLiteDump:
+        """Import the dump file (dump_newest_only.txt or .csv) into a new
+        database at path."""
+        path = Path(path)
+        dump = Dump.open(dump_path)
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.executescript(_SCHEMA)
+                conn.execute(
+                    "INSERT INTO meta (name, value) VALUES ('timestamp', ?)",
+                    (dump.timestamp,),
+                )
+                conn.executemany(
+                    "INSERT INTO glyphs (name, related, gdata, entity) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        (name, related, gdata, get_entity_name(gdata))
+                        for name, (related, gdata) in dump._data.items()
+                    ),
+                )
+                glyph_ids = dict(conn.execute("SELECT name, id FROM glyphs"))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO quotes (part, glyph_id) VALUES (?, ?)",
+                    (
+                        (line.part.base, glyph_ids[name])
+                        for name, (_related, gdata) in dump._data.items()
+                        for line in KageData(gdata).lines
+                        if line.stroke_type == 99
+                        and len(line.data) >= 8
+                        and line.part_name
+                    ),
+                )
+                # Creating the indexes after the rows is faster
+                conn.executescript(_INDEXES)
+        finally:
+            conn.close()
+        log.info("Imported %d glyphs into %s", len(dump), path)
+        return cls(path)
+
+    def _names(self, query: str, *params: str) -> list[str]:
+        return [name for (name,) in self._conn.execute(query, params)]
+
+    def _iter_aliases(self) -> Iterator[tuple[str, str]]:
+        return self._conn.execute(
+            "SELECT name, entity FROM glyphs "
+            "WHERE entity IS NOT NULL AND entity != name ORDER BY id"
+        )
+
+    def find_by_related(self, related: str) -> list[str]:
+        """Return the names of the glyphs whose related glyph is related."""
+        return self._names(
+            "SELECT name FROM glyphs WHERE related = ? ORDER BY id", related
+        )
+
+    def find_aliases(self, entity_name: str) -> list[str]:
+        """Return the names of the aliases of the glyph."""
+        return self._names(
+            "SELECT name FROM glyphs WHERE entity = ? AND name != ? ORDER BY id",
+            entity_name,
+            entity_name,
+        )
+
+    def find_quoters(self, part: str) -> list[str]:
+        """Return the names of the glyphs quoting the part in any version."""
+        return self._names(
+            "SELECT glyphs.name FROM quotes JOIN glyphs ON glyphs.id = quotes.glyph_id "
+            "WHERE quotes.part = ? ORDER BY glyphs.id",
+            part,
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def main(args: Sequence[str] | None = None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Import a GlyphWiki dump into a SQLite database that gwv can "
+        "validate and query"
+    )
+    parser.add_argument("dumpfile", type=Path)
+    parser.add_argument("dbfile", type=Path, help="Database file to create")
+    opts = parser.parse_args(args)
+
+    if opts.dbfile.exists():
+        parser.error(f"{opts.dbfile} already exists")
+    logging.basicConfig(level=logging.INFO)
+    SQLiteDump.create(opts.dbfile, opts.dumpfile)
+
+
+if __name__ == "__main__":
+    main()
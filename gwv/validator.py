@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import bisect
 import importlib
+import inspect
 import logging
-from typing import TYPE_CHECKING
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 from gwv import validators
+from gwv.checkpoint import selection_digest
+from gwv.partname import part_names
 from gwv.validatorctx import ValidatorContext
 
 if TYPE_CHECKING:
-    from gwv.dump import Dump
+    from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+
+    from gwv.checkpoint import Checkpoint
+    from gwv.dump import Dump, DumpEntry
+    from gwv.memreport import MemoryReport
+    from gwv.progress import ProgressReporter
+    from gwv.resultcache import ResultCache
 
 log = logging.getLogger(__name__)
 
@@ -23,28 +37,294 @@ def get_validator_class(name: str) -> type[validators.Validator]:
     return validator_class
 
 
+def get_validator_option_names(name: str) -> set[str]:
+    """Return the names of the keyword arguments that the validator accepts,
+    following **kwargs up to the base classes."""
+    option_names: set[str] = set()
+    for cls in get_validator_class(name).__mro__:
+        if "__init__" not in vars(cls):
+            continue
+        params = inspect.signature(vars(cls)["__init__"]).parameters.values()
+        option_names.update(
+            param.name
+            for param in params
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+            and param.name != "self"
+        )
+        if all(param.kind != param.VAR_KEYWORD for param in params):
+            break
+    return option_names
+
+
+class _ErrorCollector(validators.ValidatorErrorRecorder):
+    def __init__(self):
+        self.errors: list[Any] = []
+
+    def record(self, glyphname: str, error: Any) -> None:
+        self.errors.append(error)
+
+    def get_result(self):
+        raise NotImplementedError()
+
+
+def _collect_errors(val: validators.Validator, ctx: ValidatorContext) -> list[Any]:
+    """Run the validator and return the errors passed to its recorder
+    instead of recording them."""
+    recorder = val.recorder
+    collector = _ErrorCollector()
+    val.recorder = collector
+    try:
+        val.validate(ctx)
+    except Exception:
+        # keep the errors found so far as if they were recorded directly
+        for error in collector.errors:
+            recorder.record(ctx.glyph.name, error)
+        raise
+    finally:
+        val.recorder = recorder
+    return collector.errors
+
+
+class ContentLocalMemo:
+    """Shares the errors of content-local validators among the glyphs having
+    the same gdata.
+
+    Errors are kept only for gdata shared by more than one of the glyphs to be
+    validated, until the last of them has been validated.  If share is False,
+    errors are never shared within the run.  If a cache is given, errors are
+    also looked up in and stored to it across runs."""
+
+    def __init__(
+        self,
+        dump: Dump,
+        glyphnames: Iterable[str],
+        *,
+        share: bool = True,
+        cache: ResultCache | None = None,
+    ):
+        self._remaining: dict[str, int] = {}
+        if share:
+            counts = Counter(dump[glyphname].gdata for glyphname in glyphnames)
+            self._remaining = {
+                gdata: count for gdata, count in counts.items() if count > 1
+            }
+        self._cache = cache
+        self._memo: dict[str, dict[tuple[str, Hashable], list[Any]]] = {}
+        self.n_visits = 0
+        self.n_runs = 0
+
+    def validate(
+        self, val_name: str, val: validators.Validator, ctx: ValidatorContext
+    ) -> None:
+        self.n_visits += 1
+        gdata = ctx.glyph.gdata
+        content_key = val.content_key(ctx)
+        key = (val_name, content_key)
+        memo = self._memo.get(gdata)
+        errors = memo.get(key) if memo is not None else None
+        if errors is None:
+            if self._cache is not None:
+                errors = self._cache.get(val_name, val, gdata, content_key)
+            if errors is None:
+                self.n_runs += 1
+                errors = _collect_errors(val, ctx)
+                if self._cache is not None:
+                    self._cache.put(val_name, val, gdata, content_key, errors)
+            if gdata in self._remaining:
+                self._memo.setdefault(gdata, {})[key] = errors
+        for error in errors:
+            val.recorder.record(ctx.glyph.name, error)
+
+    def done(self, glyph: DumpEntry) -> None:
+        """Notify that all validators have validated the glyph."""
+        remaining = self._remaining.get(glyph.gdata)
+        if remaining is None:
+            return
+        if remaining > 1:
+            self._remaining[glyph.gdata] = remaining - 1
+        else:
+            del self._remaining[glyph.gdata]
+            self._memo.pop(glyph.gdata, None)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of the visits of content-local validators that were skipped"""
+        if self.n_visits == 0:
+            return 0.0
+        return 1.0 - self.n_runs / self.n_visits
+
+
+def setup_validators(
+    dump: Dump,
+    validator_names: Sequence[str],
+    validator_options: Mapping[str, Mapping[str, Any]],
+    *,
+    workers: int = 4,
+    on_setup: Callable[[str], None] | None = None,
+) -> dict[str, validators.Validator]:
+    """Import, instantiate and set up the validators using a thread pool.
+
+    The dump indexes declared in Validator.dump_indexes are built once in a
+    separate pool before the setups of the validators using them start.
+    on_setup is called with the name of each validator after its setup.
+    Returns the validators in the order of validator_names."""
+    index_futures: dict[str, Future[float]] = {}
+    index_lock = threading.Lock()
+    setup_times: dict[str, float] = {}
+
+    def build_index(index: str) -> float:
+        start = time.perf_counter()
+        dump.prepare(index)
+        return time.perf_counter() - start
+
+    def setup(name: str, index_executor: ThreadPoolExecutor) -> validators.Validator:
+        start = time.perf_counter()
+        validator_class = get_validator_class(name)
+        futures = []
+        with index_lock:
+            for index in validator_class.dump_indexes:
+                if index not in index_futures:
+                    index_futures[index] = index_executor.submit(build_index, index)
+                futures.append(index_futures[index])
+        waited = time.perf_counter()
+        for future in futures:
+            future.result()
+        waited = time.perf_counter() - waited
+        val = validator_class(**validator_options.get(name, {}))
+        val.setup(dump)
+        setup_times[name] = time.perf_counter() - start - waited
+        if on_setup is not None:
+            on_setup(name)
+        return val
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        with ThreadPoolExecutor() as index_executor:
+            futures = [
+                executor.submit(setup, name, index_executor) for name in validator_names
+            ]
+            validator_instances = {
+                name: future.result() for name, future in zip(validator_names, futures)
+            }
+    elapsed = time.perf_counter() - start
+
+    if validator_names:
+        index_times = {
+            index: future.result() for index, future in index_futures.items()
+        }
+        # Time of each validator including the indexes it waits for
+        critical_paths = {
+            name: setup_times[name]
+            + max(
+                (
+                    index_times[index]
+                    for index in validator_instances[name].dump_indexes
+                ),
+                default=0.0,
+            )
+            for name in validator_names
+        }
+        slowest = max(critical_paths, key=critical_paths.__getitem__)
+        log.info(
+            "Set up %d validators in %.2fs (%.2fs if one after another); "
+            "critical path: %s %.2fs",
+            len(validator_names),
+            elapsed,
+            sum(setup_times.values()) + sum(index_times.values()),
+            slowest,
+            critical_paths[slowest],
+        )
+    return validator_instances
+
+
 def validate(
     dump: Dump,
     validator_names: list[str] | None = None,
     *,
+    glyphnames: Iterable[str] | None = None,
     ignore_error: bool = False,
+    checkpoint: Checkpoint | None = None,
+    resume: bool = False,
+    dedup: bool = True,
+    cache: ResultCache | None = None,
+    validator_options: Mapping[str, Mapping[str, Any]] | None = None,
+    setup_workers: int = 4,
+    phase_times: dict[str, float] | None = None,
+    memory_report: MemoryReport | None = None,
+    progress: ProgressReporter | None = None,
 ):
+    """Validate the glyphs of the dump and return the results of the validators.
+
+    If phase_times is given, the seconds taken by the "setup", "validate" and
+    "get_result" phases are stored in it.  If memory_report is given, the
+    memory usage is recorded after each of these phases and the setup of
+    each validator, which are then run one by one.  If progress is given, it
+    is notified of the progress of the validation loop."""
+    phase_start = time.perf_counter()
     if validator_names is None:
         validator_names = validators.all_validator_names
+    if validator_options is None:
+        validator_options = {}
+    # Do not keep the part names of the glyphs of previous runs
+    part_names.clear()
 
-    validator_instances = {
-        name: get_validator_class(name)() for name in validator_names
-    }
+    on_setup = None
+    if memory_report is not None:
+        setup_workers = 1
 
-    for val in validator_instances.values():
-        val.setup(dump)
+        def on_setup(name: str) -> None:
+            memory_report.phase(f"setup:{name}")
+
+    validator_instances = setup_validators(
+        dump,
+        validator_names,
+        validator_options,
+        workers=setup_workers,
+        on_setup=on_setup,
+    )
+    if phase_times is not None:
+        now = time.perf_counter()
+        phase_times["setup"] = now - phase_start
+        phase_start = now
+
+    # Glyphs outside the selection are still accessible via ctx.dump
+    if glyphnames is None:
+        glyphnames = sorted(dump.keys())
+    else:
+        glyphnames = sorted({name for name in glyphnames if name in dump})
+    if checkpoint is not None:
+        selection = selection_digest(glyphnames)
+    if checkpoint is not None and resume:
+        last_glyphname = checkpoint.load(
+            dump.timestamp,
+            validator_instances,
+            selection=selection,
+            validator_options=validator_options,
+        )
+        if last_glyphname is not None:
+            glyphnames = glyphnames[bisect.bisect_right(glyphnames, last_glyphname) :]
+
+    memo = None
+    if (dedup or cache is not None) and any(
+        val.content_local for val in validator_instances.values()
+    ):
+        memo = ContentLocalMemo(dump, glyphnames, share=dedup, cache=cache)
+
+    if progress is not None:
+        progress.start(len(glyphnames), list(validator_instances))
 
-    for glyphname in sorted(dump.keys()):
+    for i, glyphname in enumerate(glyphnames, 1):
         entry = dump[glyphname]
         ctx = ValidatorContext(dump, entry)
-        for val in validator_instances.values():
+        sampled = progress is not None and progress.is_sampled(i)
+        for val_name, val in validator_instances.items():
+            if sampled:
+                val_start = time.perf_counter()
             try:
-                val.validate(ctx)
+                if memo is not None and val.content_local:
+                    memo.validate(val_name, val, ctx)
+                else:
+                    val.validate(ctx)
             except Exception:
                 log.exception(
                     "Exception while %s is validating %s",
@@ -53,8 +333,51 @@ def validate(
                 )
                 if not ignore_error:
                     raise
+            if sampled:
+                progress.add_sample(val_name, time.perf_counter() - val_start)
+        if memo is not None:
+            memo.done(entry)
+
+        if checkpoint is not None and i % checkpoint.interval == 0:
+            checkpoint.save(
+                dump.timestamp,
+                glyphname,
+                validator_instances,
+                selection=selection,
+                validator_options=validator_options,
+            )
+        if progress is not None:
+            progress.update(i)
+
+    if progress is not None:
+        progress.finish()
+
+    if memo is not None:
+        log.info(
+            "Content-local validators ran %d times for %d glyph visits "
+            "(dedup ratio: %.1f%%)",
+            memo.n_runs,
+            memo.n_visits,
+            memo.dedup_ratio * 100,
+        )
+
+    if phase_times is not None:
+        now = time.perf_counter()
+        phase_times["validate"] = now - phase_start
+        phase_start = now
+    if memory_report is not None:
+        memory_report.phase("validate")
+        memory_report.attribute(dump, validator_instances)
 
-    return {
-        val_name: {"timestamp": dump.timestamp, "result": val.get_result()}
-        for val_name, val in validator_instances.items()
-    }
+    results: dict[str, dict[str, Any]] = {}
+    for val_name, val in validator_instances.items():
+        results[val_name] = {"timestamp": dump.timestamp, "result": val.get_result()}
+        totals = val.get_totals()
+        if totals:
+            # Numbers of errors including those not kept because of the limit
+            results[val_name]["total"] = totals
+    if phase_times is not None:
+        phase_times["get_result"] = time.perf_counter() - phase_start
+    if memory_report is not None:
+        memory_report.phase("get_result")
+    return results
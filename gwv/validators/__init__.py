@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import abc
-from collections import defaultdict
+import array
+import heapq
+import random
 from enum import Enum
-from typing import TYPE_CHECKING, Any, NamedTuple
+from typing import TYPE_CHECKING, Any, ClassVar, NamedTuple
 
 from gwv.kagedata import KageLine
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Hashable, Iterable, Mapping
 
     from gwv.dump import Dump
     from gwv.validatorctx import ValidatorContext
@@ -35,6 +37,12 @@ all_validator_names = [
 ]
 
 
+def param_to_serializable(p: Any) -> Any:
+    if isinstance(p, KageLine):
+        return (p.line_number, p.strdata)
+    return p
+
+
 class ValidatorErrorRecorder(abc.ABC):
     @abc.abstractmethod
     def record(self, glyphname: str, error: Any) -> None:
@@ -44,33 +52,277 @@ class ValidatorErrorRecorder(abc.ABC):
     def get_result(self) -> dict[str, list[Any]]:
         raise NotImplementedError()
 
+    def get_totals(self) -> dict[str, int]:
+        """Return the numbers of errors recorded for the error codes whose
+        errors were not all kept."""
+        return {}
+
+    def set_bounds(self, bounds: Mapping[str, BoundedRows]) -> None:
+        raise NotImplementedError()
+
+    def get_state(self) -> Any:
+        """Return a JSON-serializable snapshot of the recorded errors."""
+        raise NotImplementedError()
+
+    def set_state(self, state: Any) -> None:
+        """Restore the recorded errors from a snapshot made by get_state."""
+        raise NotImplementedError()
+
+
+class BoundedRows(abc.ABC):
+    """Storage of at most limit rows recorded for an error code.
+
+    total is the number of rows recorded, including those not kept."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.total = 0
+
+    @abc.abstractmethod
+    def append(self, row: list) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_rows(self) -> list[list]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def get_state(self) -> Any:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def set_state(self, state: Any) -> None:
+        raise NotImplementedError()
+
+
+class CappedRows(BoundedRows):
+    """Keeps the first limit rows."""
+
+    def __init__(self, limit: int):
+        super().__init__(limit)
+        self._rows: list[list] = []
+
+    def append(self, row: list) -> None:
+        self.total += 1
+        if len(self._rows) < self.limit:
+            self._rows.append(row)
+
+    def get_rows(self) -> list[list]:
+        return self._rows
+
+    def get_state(self) -> dict[str, Any]:
+        return {"limit": self.limit, "total": self.total, "rows": self._rows}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self.total = state["total"]
+        self._rows = state["rows"]
+
+
+class TopKRows(BoundedRows):
+    """Keeps the limit rows with the largest keys, sorted in descending order of
+    the key.  Rows with equal keys are kept in the order they were recorded."""
+
+    def __init__(self, limit: int, key: Callable[[list], Any]):
+        super().__init__(limit)
+        self.key = key
+        # min-heap of (key, -serial, row), so that the smallest key recorded
+        # last is evicted first
+        self._heap: list[tuple[Any, int, list]] = []
+
+    def append(self, row: list) -> None:
+        item = (self.key(row), -self.total, row)
+        self.total += 1
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def get_rows(self) -> list[list]:
+        return [row for _key, _serial, row in sorted(self._heap, reverse=True)]
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "total": self.total,
+            "rows": [[-serial, row] for _key, serial, row in self._heap],
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self.total = state["total"]
+        self._heap = [(self.key(row), -serial, row) for serial, row in state["rows"]]
+        heapq.heapify(self._heap)
+
+
+class SampledRows(BoundedRows):
+    """Keeps a uniform random sample of limit rows (reservoir sampling) in the
+    order they were recorded.  The sample is reproducible for a given seed."""
+
+    def __init__(self, limit: int, seed: int = 0):
+        super().__init__(limit)
+        self._random = random.Random(seed)
+        self._rows: list[tuple[int, list]] = []
+
+    def append(self, row: list) -> None:
+        serial = self.total
+        self.total += 1
+        if len(self._rows) < self.limit:
+            self._rows.append((serial, row))
+            return
+        i = self._random.randrange(self.total)
+        if i < self.limit:
+            self._rows[i] = (serial, row)
+
+    def get_rows(self) -> list[list]:
+        return [row for _serial, row in sorted(self._rows, key=lambda r: r[0])]
+
+    def get_state(self) -> dict[str, Any]:
+        version, internal, gauss_next = self._random.getstate()
+        return {
+            "limit": self.limit,
+            "total": self.total,
+            "rows": self._rows,
+            "random": [version, list(internal), gauss_next],
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self.total = state["total"]
+        self._rows = [(serial, row) for serial, row in state["rows"]]
+        version, internal, gauss_next = state["random"]
+        self._random.setstate((version, tuple(internal), gauss_next))
+
 
 class ValidatorErrorTupleRecorder(ValidatorErrorRecorder):
+    """Records errors as rows of the glyph name followed by the parameters.
+
+    The errors are stored in columns: the ids of the error codes and of the
+    glyph names in compact arrays, and references to the parameters in a list.
+    The rows are built, with the parameters converted to JSON-serializable
+    values, only when the result is requested."""
+
     def __init__(self):
-        self._results: dict[str, list[list]] = defaultdict(list)
+        self._errcodes: list[str] = []
+        self._errcode_ids: dict[str, int] = {}
+        self._glyphnames: list[str] = []
+        self._errcode_col = array.array("H")
+        self._glyph_col = array.array("I")
+        self._param_col: list[Iterable] = []
+        self._bounded: dict[str, BoundedRows] = {}
+
+    def set_bounds(self, bounds: Mapping[str, BoundedRows]) -> None:
+        """Store the rows of the given error codes in the bounded storages."""
+        self._bounded = dict(bounds)
 
     def record(self, glyphname: str, error: tuple[str, Iterable]) -> None:
         key, param = error
-        param = [self.param_to_serializable(p) for p in param]
-        self._results[key].append([glyphname] + list(param))
+        if self._bounded:
+            bounded = self._bounded.get(key)
+            if bounded is not None:
+                bounded.append(self._make_row(glyphname, param))
+                return
+        errcode_id = self._errcode_ids.get(key)
+        if errcode_id is None:
+            errcode_id = self._errcode_ids[key] = len(self._errcodes)
+            self._errcodes.append(key)
+        # Errors of a glyph are recorded consecutively
+        if not self._glyphnames or self._glyphnames[-1] != glyphname:
+            self._glyphnames.append(glyphname)
+        self._errcode_col.append(errcode_id)
+        self._glyph_col.append(len(self._glyphnames) - 1)
+        self._param_col.append(param)
+
+    def _make_row(self, glyphname: str, param: Iterable) -> list:
+        return [glyphname, *map(self.param_to_serializable, param)]
 
     def param_to_serializable(self, p: Any) -> Any:
-        if isinstance(p, KageLine):
-            return (p.line_number, p.strdata)
-        return p
+        return param_to_serializable(p)
+
+    def _get_rows(self) -> dict[str, list[list]]:
+        rows: list[list[list]] = [[] for _ in self._errcodes]
+        glyphnames = self._glyphnames
+        make_row = self._make_row
+        for errcode_id, glyph_id, param in zip(
+            self._errcode_col, self._glyph_col, self._param_col
+        ):
+            rows[errcode_id].append(make_row(glyphnames[glyph_id], param))
+        return dict(zip(self._errcodes, rows))
 
     def get_result(self) -> dict[str, list[list]]:
-        return dict(self._results)
+        result = self._get_rows()
+        for key, bounded in self._bounded.items():
+            if bounded.total:
+                result[key] = bounded.get_rows()
+        return result
+
+    def get_totals(self) -> dict[str, int]:
+        return {
+            key: bounded.total
+            for key, bounded in self._bounded.items()
+            if bounded.total > bounded.limit
+        }
+
+    def get_state(self) -> dict[str, Any]:
+        return {
+            "results": self._get_rows(),
+            "bounded": {
+                key: bounded.get_state() for key, bounded in self._bounded.items()
+            },
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        bounded_states: dict[str, Any] = state["bounded"]
+        if bounded_states.keys() != self._bounded.keys() or any(
+            bounded_state["limit"] != self._bounded[key].limit
+            for key, bounded_state in bounded_states.items()
+        ):
+            raise ValueError("The checkpoint was made with a different limit")
+        for key, bounded_state in bounded_states.items():
+            self._bounded[key].set_state(bounded_state)
+        self._errcodes.clear()
+        self._errcode_ids.clear()
+        self._glyphnames.clear()
+        del self._errcode_col[:], self._glyph_col[:], self._param_col[:]
+        for key, rows in state["results"].items():
+            for glyphname, *param in rows:
+                self.record(glyphname, (key, param))
 
 
 class Validator(metaclass=abc.ABCMeta):
     recorder_cls: type[ValidatorErrorRecorder] = ValidatorErrorTupleRecorder
 
-    def __init__(self):
+    content_local: ClassVar[bool] = False
+    """Whether the errors of a glyph depend only on its gdata and content_key.
+
+    Errors of a content-local validator may be computed once for all glyphs
+    sharing the same gdata and content_key, and recorded for each of them."""
+
+    def content_key(self, ctx: ValidatorContext, /) -> Hashable:
+        """Return the properties other than gdata that the errors depend on.
+
+        Only meaningful for content-local validators."""
+        return ctx.category, ctx.is_hikanji
+
+    dump_indexes: ClassVar[tuple[str, ...]] = ()
+    """Indexes of the dump (see Dump.prepare) used by the validator, which are
+    built before setup is called."""
+
+    bounded_errcodes: ClassVar[Mapping[str, Callable[[int], BoundedRows]]] = {}
+    """Factories of the storages that keep at most limit errors of the error
+    codes, used when the validator is constructed with the limit option."""
+
+    def __init__(self, *, limit: int | None = None):
         self.recorder = self.recorder_cls()
+        if limit is not None and self.bounded_errcodes:
+            self.recorder.set_bounds(
+                {
+                    errcode: factory(limit)
+                    for errcode, factory in self.bounded_errcodes.items()
+                }
+            )
 
     def setup(self, dump: Dump):  # noqa: B027
-        pass
+        """Prepare for the validation of the dump.
+
+        The setups of the validators run concurrently in threads."""
 
     @abc.abstractmethod
     def validate(self, ctx: ValidatorContext, /) -> Any:
@@ -82,6 +334,19 @@ class Validator(metaclass=abc.ABCMeta):
     def get_result(self) -> dict[str, list[Any]]:
         return self.recorder.get_result()
 
+    def get_totals(self) -> dict[str, int]:
+        return self.recorder.get_totals()
+
+    def get_state(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the validation progress.
+
+        Subclasses that accumulate data outside of the recorder must extend
+        this and set_state so that a checkpointed run can be resumed."""
+        return {"recorder": self.recorder.get_state()}
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        self.recorder.set_state(state["recorder"])
+
 
 class SingleErrorValidator(Validator):
     @abc.abstractmethod
@@ -727,6 +727,16 @@ def _try_connect_tate_middle(tate: Segment, yoko: Segment, yoko_pos: Literal[0,
 
 
 class CornerValidator(Validator):
+    content_local = True
+
+    def content_key(self, ctx: ValidatorContext):
+        return (
+            ctx.category == "user-owned",
+            ctx.is_hikanji,
+            bool(_re_gdesign.fullmatch(ctx.glyph.name)),
+            bool(_re_tdesign.fullmatch(ctx.glyph.name)),
+        )
+
     @filters.check_only(-filters.is_alias)
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     @filters.check_only(-filters.is_hikanji)
@@ -23,7 +23,7 @@ class DelquoteValidator(Validator):
     def validate(self, ctx: ValidatorContext) -> None:
         error_part_names: set[str] = set()
         for line in ctx.glyph.kage.lines:
-            if line.stroke_type == 99 and line.part_name.split("@")[0] not in ctx.dump:
+            if line.stroke_type == 99 and line.part.base not in ctx.dump:
                 # 無い部品を引用している
                 error_part_names.add(line.part_name)
         for error_part_name in error_part_names:
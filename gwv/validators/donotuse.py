@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from collections import deque
 from typing import TYPE_CHECKING, Any, NamedTuple
 
 from gwv import filters
+from gwv.kagedata import KageLine
+from gwv.partname import part_names
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
+    from gwv.dump import Dump
     from gwv.validatorctx import ValidatorContext
 
 
@@ -14,22 +18,69 @@ class DonotuseValidatorError(ValidatorErrorEnum):
     class DO_NOT_USE(NamedTuple):
         """do-not-use が引用されている"""
 
-        parts: list[str]
+        parts: list[str] | list[list[str]]
 
 
 E = DonotuseValidatorError
 
 
+def get_do_not_use_parts(dump: Dump) -> dict[str, str | None]:
+    """Return the glyphs that must not be quoted.
+
+    A glyph is do-not-use if its data contains "do-not-use", or if its data
+    consists only of a quote of a do-not-use glyph.  The value is the name of
+    the do-not-use glyph quoted by the key, or None for the former case."""
+    do_not_use: dict[str, str | None] = {}
+    quoters: dict[str, list[tuple[str, str]]] = {}
+    for name in dump:
+        gdata = dump[name].gdata
+        if "do-not-use" in gdata:
+            do_not_use[name] = None
+        elif "$" not in gdata:
+            line = KageLine(0, gdata)
+            if line.stroke_type == 99 and len(line.data) >= 8:
+                quoters.setdefault(line.part.base, []).append((name, line.part_name))
+
+    queue = deque(do_not_use)
+    while queue:
+        quoted = queue.popleft()
+        for quoter, part_name in quoters.get(quoted, ()):
+            if quoter not in do_not_use:
+                do_not_use[quoter] = part_name
+                queue.append(quoter)
+    return do_not_use
+
+
 class DonotuseValidator(SingleErrorValidator):
+    def __init__(self, report_chain: bool = False, **kwargs):
+        """If report_chain is true, each quoted part is reported together with
+        the glyphs it quotes up to the one marked do-not-use."""
+        super().__init__(**kwargs)
+        self.report_chain = report_chain
+        self.do_not_use: dict[str, str | None] = {}
+
+    def setup(self, dump: Dump):
+        self.do_not_use = get_do_not_use_parts(dump)
+
+    def get_chain(self, part_name: str) -> list[str]:
+        chain = [part_name]
+        quoted = self.do_not_use[part_names.get(part_name).base]
+        while quoted is not None:
+            chain.append(quoted)
+            quoted = self.do_not_use[part_names.get(quoted).base]
+        return chain
+
     @filters.check_only(-filters.is_alias)
     def is_invalid(self, ctx: ValidatorContext):
-        quotings = []
+        quotings: list[Any] = []
         for line in ctx.glyph.kage.lines:
             if line.stroke_type != 99:
                 continue
-            part_entry = ctx.dump.get(line.part_name.split("@")[0])
-            if part_entry and "do-not-use" in part_entry.gdata:
-                quotings.append(line.part_name)
+            if line.part.base in self.do_not_use:
+                if self.report_chain:
+                    quotings.append(self.get_chain(line.part_name))
+                else:
+                    quotings.append(line.part_name)
         if quotings:
             return E.DO_NOT_USE(quotings)
         return False
@@ -144,6 +144,11 @@ def dup_coords(elems: list[tuple[KageLine, list[int]]], thresh: int):
 
 
 class DupValidator(SingleErrorValidator):
+    content_local = True
+
+    def content_key(self, ctx: ValidatorContext):
+        return (ctx.category == "user-owned", ctx.is_hikanji)
+
     @filters.check_only(-filters.is_alias)
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     @filters.check_only(-filters.has_transform)
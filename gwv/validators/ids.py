@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import re
 from typing import TYPE_CHECKING, NamedTuple
 
 from gwv import filters
-from gwv.helper import RE_REGIONS
+from gwv.idsparser import parse_ids
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
+    from gwv.idsparser import IDSToken
     from gwv.kagedata import KageData, KageLine
     from gwv.validatorctx import ValidatorContext
 
@@ -79,22 +79,17 @@ class IdsValidatorError(ValidatorErrorEnum):
 E = IdsValidatorError
 
 
-_re_idc = re.compile(r"u2ff[\da-f]|u31ef")
-_re_vars = re.compile(r"-" + RE_REGIONS + r"?(\d{2})(?:-(?:var|itaiji)-\d{3})?(?=@|$)")
-
-
-def indexOfFirstKanjiBuhinLine(sname: list[str], kage: KageData):
+def indexOfFirstKanjiBuhinLine(tokens: tuple[IDSToken, ...], kage: KageData):
     """IDSの最初の漢字を部品としているKageLine（なければNone）を返す"""
-    for i, sname_i in enumerate(sname):
-        if _re_idc.fullmatch(sname_i):
-            continue
-        firstKanji = sname_i
-        if firstKanji == "cdp":
-            firstKanji += "-" + sname[i + 1]
-        for line in kage.lines:
-            if line.stroke_type == 99 and line.part_name.startswith(firstKanji):
-                return line
+    firstKanji = next((token.text for token in tokens if token.kind != "idc"), None)
+    if firstKanji is None:
         return None
+    # cdp-XXXX 以外は最初の "-" までの接頭辞で照合する（cdpo-XXXX なら cdpo）
+    if not firstKanji.startswith("cdp-"):
+        firstKanji = firstKanji.split("-")[0]
+    for line in kage.lines:
+        if line.stroke_type == 99 and line.part_name.startswith(firstKanji):
+            return line
     return None
 
 
@@ -115,18 +110,15 @@ class IdsValidator(SingleErrorValidator):
         else:
             aspect = abs(float(x1 - x2) / (y1 - y2))
 
-        sname = ctx.glyph.name.split("-")
+        tokens = parse_ids(ctx.glyph.name).tokens
+        sname = [token.text for token in tokens[:2]]
 
         # ⿰⿱ とか ⿱⿰ とかで始まるものは最初の部品の縦横比を予測できない
         isComplicated = (
             sname[1] in ("u2ff0", "u2ff2") and sname[0] in ("u2ff1", "u2ff3")
         ) or (sname[1] in ("u2ff1", "u2ff3") and sname[0] in ("u2ff0", "u2ff2"))
 
-        m = _re_vars.search(f_part_name)
-        if m:
-            firstBuhinType: str | None = m.group(1)  # 偏化変形接尾コード
-        else:
-            firstBuhinType = None
+        firstBuhinType = kage.lines[0].part.henka  # 偏化変形接尾コード
         if sname[0] in ("u2ff0", "u2ff2"):
             # [-01] + [-02] or [-01] + [-01] + [-02]
             if firstBuhinType in ("03", "04", "09", "14", "24") and x2 - x1 > 175.0:
@@ -142,7 +134,7 @@ class IdsValidator(SingleErrorValidator):
             ):
                 # 左右のIDSだが最初の部品が横長の配置
                 return E.FIRST_PART_LANDSCAPE_IN_LR_IDS(kage.lines[0])
-            fkline = indexOfFirstKanjiBuhinLine(sname, kage)
+            fkline = indexOfFirstKanjiBuhinLine(tokens, kage)
             if fkline is not None and fkline.line_number != 0:
                 # 左右のIDSだが左の字が最初でない
                 return E.LEFT_PART_NOT_FIRST_IN_LR_IDS(fkline)
@@ -161,7 +153,7 @@ class IdsValidator(SingleErrorValidator):
             ):
                 # 上下のIDSだが最初の部品が縦長の配置
                 return E.FIRST_PART_PORTRAIT_IN_TB_IDS(kage.lines[0])
-            fkline = indexOfFirstKanjiBuhinLine(sname, kage)
+            fkline = indexOfFirstKanjiBuhinLine(tokens, kage)
             if fkline is not None and fkline.line_number != 0:
                 # 上下のIDSだが上の字が最初でない
                 return E.TOP_PART_NOT_FIRST_IN_TB_IDS(fkline)
@@ -180,16 +172,16 @@ class IdsValidator(SingleErrorValidator):
             if firstBuhinType in ("02", "06", "07"):
                 # 囲むIDSだが内側部品が最初
                 return E.FIRST_PART_INNER_IN_SURROUND_IDS(f_part_name)
-            fkline = indexOfFirstKanjiBuhinLine(sname, kage)
+            fkline = indexOfFirstKanjiBuhinLine(tokens, kage)
             if fkline is not None and fkline.line_number != 0:
                 # 囲みIDSだが外の字が最初でない
                 return E.OUTER_PART_NOT_FIRST_IN_SURROUND_IDS(fkline)
         elif sname[0] == "u2ffb":
-            fkline = indexOfFirstKanjiBuhinLine(sname, kage)
+            fkline = indexOfFirstKanjiBuhinLine(tokens, kage)
             if fkline is not None and fkline.line_number != 0:
                 # 重ねIDSだがIDSで最初の字が最初でない
                 return E.FIRST_PART_NOT_FIRST_IN_OVERLAP_IDS(fkline)
-        elif sname[0] in ("u2ffe, u2fff", "u31ef"):
+        elif sname[0] in ("u2ffe", "u2fff", "u31ef"):
             pass
         else:
             return E.UNKNOWN_IDC(sname[0])  # 未定義のIDC
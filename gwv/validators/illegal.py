@@ -110,7 +110,7 @@ def is_alias_like(kage: KageData):
                 # transform commands
                 return False
         elif stype == 99:
-            if not (len(line.data) >= 7 and line.coords == [(0, 0), (200, 200)]):
+            if not (len(line.data) >= 7 and line.coords == ((0, 0), (200, 200))):
                 return False
             sx, sy = line.data[1:3]
             if sx is None or sy is None:
@@ -324,15 +324,21 @@ def validate_stroke_line(ctx: ValidatorContext, line: KageLine):
 
 class IllegalValidatorErrorRecorder(ValidatorErrorTupleRecorder):
     def get_result(self):
-        for val in self._results.values():
+        result = super().get_result()
+        for val in result.values():
             if val and len(val[0]) >= 3 and type(val[0][1]) is str:
                 val.sort(key=lambda r: r[1])
-        return super().get_result()
+        return result
 
 
 class IllegalValidator(Validator):
     recorder_cls = IllegalValidatorErrorRecorder
 
+    content_local = True
+
+    def content_key(self, ctx: ValidatorContext):
+        return (ctx.category == "user-owned", ctx.is_hikanji)
+
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     def validate(self, ctx: ValidatorContext) -> None:
         for line in ctx.glyph.kage.lines:
@@ -71,12 +71,15 @@ _re_region_opthenka = re.compile(r"-(" + RE_REGIONS + r")(\d{2})?")
 
 
 class JValidator(SingleErrorValidator):
-    def __init__(self):
-        SingleErrorValidator.__init__(self)
+    dump_indexes = ("aliases", "relations")
+
+    def __init__(self, **kwargs):
+        SingleErrorValidator.__init__(self, **kwargs)
         self.jv_no_use_part_replacement: dict[str, str] = {}
         self.jv_no_apply_parts: set[str] = set()
 
     def setup(self, dump: Dump):
+        source_separation.get_data()
         jv_data = load_package_data("data/jv.yaml")
         self.jv_no_use_part_replacement = {
             no_use_alias: use
@@ -100,9 +103,7 @@ class JValidator(SingleErrorValidator):
 
     def checkJV(self, kage: KageData):
         used_parts = [
-            kageline.part_name.split("@")[0]
-            for kageline in kage.lines
-            if kageline.stroke_type == 99
+            kageline.part.base for kageline in kage.lines if kageline.stroke_type == 99
         ]
         if any(part in self.jv_no_apply_parts for part in used_parts):
             return False  # 簡体字特有の字形
@@ -174,7 +175,7 @@ class JValidator(SingleErrorValidator):
 
         entity_name = ctx.entity.name
 
-        if ucs not in ctx.dump:
+        if ctx.glyph.name not in ctx.dump.relations.nomark:
             return False  # 無印が見つからない
         nomark_entity_name = ctx.dump.get_entity_name(ucs)
 
@@ -184,10 +185,11 @@ class JValidator(SingleErrorValidator):
 
         if region != "jv":
             return False
-        if (ucs + "-j") in ctx.dump:
+        regional = ctx.dump.relations.regional.get(ucs, {})
+        if "j" in regional:
             # uxxxx-jv と uxxxx-j  が共存している
             return E.J_JV_COEXISTENT("j")
-        if (ucs + "-ja") in ctx.dump:
+        if "ja" in regional:
             # uxxxx-jv と uxxxx-ja が共存している
             return E.J_JV_COEXISTENT("ja")
         if ucs not in self.jv_no_apply_parts:
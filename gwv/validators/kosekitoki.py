@@ -32,13 +32,14 @@ E = KosekitokiValidatorError
 
 
 class KosekitokiValidator(SingleErrorValidator):
+    dump_indexes = ("relations",)
+
     @filters.check_only(+filters.is_of_category({"toki"}))
     def is_invalid(self, ctx: ValidatorContext):
-        (num,) = ctx.category_param[1]
-        if not num.startswith("00"):
+        koseki_name = ctx.dump.relations.koseki_of_toki.get(ctx.glyph.name)
+        if koseki_name is None:
             return False
 
-        koseki_name = "koseki-" + num[2:]
         if koseki_name in ctx.dump:
             koseki_entity = ctx.dump.get_entity_name(koseki_name)
         else:
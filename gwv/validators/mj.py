@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import bisect
+import functools
 import re
 from typing import TYPE_CHECKING, NamedTuple
 
 from gwv import filters
 from gwv.helper import isTogoKanji, load_package_data
+from gwv.packed import MJTABLE_MAGIC, PackedReader
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from gwv.packed import StringArray
     from gwv.validatorctx import ValidatorContext
 
 
@@ -52,10 +58,10 @@ def gl2kuten(gl_: str):
     return (gl >> 8) - 32, (gl & 0xFF) - 32
 
 
-_re_ivs = re.compile(r"u[0-9a-f]{4,6}-ue01[0-9a-f]{2}")
-_re_svs = re.compile(r"u[0-9a-f]{4,6}-ufe0[0-9a-f]")
-_re_ucs = re.compile(r"u([0-9a-f]{4,6})(?:-.+)?")
-_re_ids = re.compile(r"(?:u2ff[\da-f]|u31ef)-.+")
+_re_ucs = re.compile(r"u([0-9a-f]{4,6})(?:-(.+))?")
+_re_ivs_tail = re.compile(r"ue01[0-9a-f]{2}")
+_re_svs_tail = re.compile(r"ufe0[0-9a-f]")
+_re_ids_cp = re.compile(r"2ff[\da-f]|31ef")
 _re_koseki = re.compile(r"koseki-(\d{6})")
 _re_jmj = re.compile(r"jmj-(\d{6})")
 _re_juki = re.compile(r"juki-([0-9a-f]{4})")
@@ -69,6 +75,22 @@ _re_shincho = re.compile(r"shincho-(\d{5})")
 _re_sdjt = re.compile(r"sdjt-(\d{5})")
 
 
+class MJField(NamedTuple):
+    """Packed data of a field of MJ table.
+
+    keys is the sorted list of the (lowercased) keys in the field.
+    The row numbers having keys[i] are
+    key_rows[key_offsets[i]:key_offsets[i + 1]], and the indices to keys of the
+    row number idx are row_keys[row_offsets[idx]:row_offsets[idx + 1]].
+    """
+
+    keys: StringArray
+    key_offsets: Sequence[int]
+    key_rows: Sequence[int]
+    row_offsets: Sequence[int]
+    row_keys: Sequence[int]
+
+
 class MJTable:
     FIELD_JMJ = 0
     FIELD_KOSEKI = 1
@@ -119,96 +141,100 @@ class MJTable:
     def glyphname_to_field_key(
         self, glyphname: str
     ) -> tuple[int, str] | tuple[None, None]:
-        if _re_ivs.fullmatch(glyphname):
-            return MJTable.FIELD_IVS, glyphname
-
-        if _re_svs.fullmatch(glyphname):
-            return MJTable.FIELD_SVS, glyphname
-
-        m = _re_ucs.fullmatch(glyphname)
-        if m and not _re_ids.fullmatch(glyphname):
-            # ucs but not ids
-            return MJTable.FIELD_UCS, m.group(1)
-
-        m = _re_koseki.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_KOSEKI, m.group(1)
-
-        m = _re_jmj.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_JMJ, m.group(1)
-
-        m = _re_juki.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_JUKI, m.group(1)
-
-        m = _re_nyukan.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_NYUKAN, m.group(1)
-
-        m = _re_toki.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_TOKI, m.group(1)
-
-        m = _re_dkw.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_DKW, m.group(1)
-
-        # x0213(plane 1)
-        m = _re_jx1.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_X0213, "1-" + m.group(1)
-
-        # x0213(plane 2)
-        m = _re_jx2.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_X0213, "2-" + m.group(1)
-
-        m = _re_jsp.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_X0212, m.group(1)
-
-        m = _re_shincho.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_SHINCHO, m.group(1)
-
-        m = _re_sdjt.fullmatch(glyphname)
-        if m:
-            return MJTable.FIELD_SDJT, m.group(1)
-
-        return None, None
+        return glyphname_to_field_key(glyphname)
 
     def get(self, idx: int, field: int) -> list[str]:
-        keys = self._table[idx][field]
-        if keys is None:
-            return []
-        if not isinstance(keys, list):
-            keys = [keys]
-        return [self.key2gw(field, key) for key in keys]
+        mjfield = self._get_field(field)
+        stt = mjfield.row_offsets[idx]
+        end = mjfield.row_offsets[idx + 1]
+        return [
+            self.key2gw(field, mjfield.keys[key_idx])
+            for key_idx in mjfield.row_keys[stt:end]
+        ]
 
     def search(self, field: int, key: str) -> list[int]:
-        return self._key2indices[field].get(key.lower(), [])
+        mjfield = self._get_field(field)
+        key = key.lower()
+        key_idx = bisect.bisect_left(mjfield.keys, key)
+        if key_idx == len(mjfield.keys) or mjfield.keys[key_idx] != key:
+            return []
+        stt = mjfield.key_offsets[key_idx]
+        end = mjfield.key_offsets[key_idx + 1]
+        return list(mjfield.key_rows[stt:end])
 
     def __init__(self):
-        self._table: list[list[str | list[str] | None]] = load_package_data(
-            "data/3rd/mj.json"
-        )
-
-        self._key2indices: list[dict[str, list[int]]] = [
-            {} for _ in range(MJTable.n_fields)
+        self._fields: list[MJField]
+
+    def load(self):
+        # The table is prebuilt by bdat/build_mj.py and memory-mapped
+        reader = PackedReader(load_package_data("data/3rd/mj.bin"), MJTABLE_MAGIC)
+        _n_rows, n_fields = reader.read_uint32_array()
+        assert n_fields == MJTable.n_fields
+        self._fields = [
+            MJField(
+                keys=reader.read_string_array(),
+                key_offsets=reader.read_uint32_array(),
+                key_rows=reader.read_uint32_array(),
+                row_offsets=reader.read_uint32_array(),
+                row_keys=reader.read_uint32_array(),
+            )
+            for _ in range(n_fields)
         ]
-        for mjIdx, row in enumerate(self._table):
-            for column, keys in enumerate(row):
-                if keys is None:
-                    continue
-                if not isinstance(keys, list):
-                    keys = [keys]
-                for key in keys:
-                    self._key2indices[column].setdefault(key.lower(), []).append(mjIdx)
+
+    def _get_field(self, field: int) -> MJField:
+        if not hasattr(self, "_fields"):
+            self.load()
+        return self._fields[field]
 
 
 mjtable = MJTable()
 
+# pattern, field and prefix of the key for each leading token of non-UCS names
+_glyphname_fields: dict[str, tuple[re.Pattern[str], int, str]] = {
+    "koseki": (_re_koseki, MJTable.FIELD_KOSEKI, ""),
+    "jmj": (_re_jmj, MJTable.FIELD_JMJ, ""),
+    "juki": (_re_juki, MJTable.FIELD_JUKI, ""),
+    "nyukan": (_re_nyukan, MJTable.FIELD_NYUKAN, ""),
+    "toki": (_re_toki, MJTable.FIELD_TOKI, ""),
+    "dkw": (_re_dkw, MJTable.FIELD_DKW, ""),
+    "jx1": (_re_jx1, MJTable.FIELD_X0213, "1-"),  # x0213(plane 1)
+    "jx2": (_re_jx2, MJTable.FIELD_X0213, "2-"),  # x0213(plane 2)
+    "jsp": (_re_jsp, MJTable.FIELD_X0212, ""),
+    "shincho": (_re_shincho, MJTable.FIELD_SHINCHO, ""),
+    "sdjt": (_re_sdjt, MJTable.FIELD_SDJT, ""),
+}
+
+
+def glyphname_to_field_key(glyphname: str) -> tuple[int, str] | tuple[None, None]:
+    """Return the field of MJ table and the key in it that the glyph name
+    corresponds to, or (None, None) if there is no such field."""
+    if glyphname.startswith("u"):
+        m = _re_ucs.fullmatch(glyphname)
+        if m is None:
+            return None, None
+        cp, tail = m.groups()
+        if tail is not None:
+            if tail.startswith("ue01") and _re_ivs_tail.fullmatch(tail):
+                return MJTable.FIELD_IVS, glyphname
+            if tail.startswith("ufe0") and _re_svs_tail.fullmatch(tail):
+                return MJTable.FIELD_SVS, glyphname
+            if _re_ids_cp.fullmatch(cp):
+                return None, None  # ids
+        return MJTable.FIELD_UCS, cp
+
+    entry = _glyphname_fields.get(glyphname.split("-", 1)[0])
+    if entry is None:
+        return None, None
+    regex, field, prefix = entry
+    m = regex.fullmatch(glyphname)
+    if m is None:
+        return None, None
+    return field, prefix + m.group(1)
+
+
+# Entity names are looked up once for each of their aliases
+entity_name_to_field_key = functools.lru_cache(maxsize=1 << 16)(glyphname_to_field_key)
+
 
 def get_base(name: str, field: int):
     if field == MJTable.FIELD_UCS:
@@ -224,7 +250,7 @@ class MjValidator(SingleErrorValidator):
         -filters.is_of_category({"user-owned", "ids", "cdp", "ext", "bsh"})
     )
     def is_invalid(self, ctx: ValidatorContext):
-        field, key = mjtable.glyphname_to_field_key(ctx.glyph.name)
+        field, key = glyphname_to_field_key(ctx.glyph.name)
         if field is None:
             return False
         assert key is not None
@@ -236,7 +262,7 @@ class MjValidator(SingleErrorValidator):
             return False
 
         if ctx.glyph.entity_name is not None and not _re_itaiji.search(ctx.glyph.name):
-            e_field, e_key = mjtable.glyphname_to_field_key(ctx.glyph.entity_name)
+            e_field, e_key = entity_name_to_field_key(ctx.glyph.entity_name)
             if e_field is not None and e_field != field:
                 assert e_key is not None
                 entity_expected = set()
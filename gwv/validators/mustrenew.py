@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, NamedTuple
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from gwv import filters
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
+    from gwv.dump import Dump
+    from gwv.partname import PartName
     from gwv.validatorctx import ValidatorContext
+    from gwv.versionstore import VersionStore
+
+
+class VersionInfo(NamedTuple):
+    version: int
+    latest_version: int | None
+    distance: int | None  # 最新版までの版の数
+    differs: bool | None  # 旧版と最新版のデータが異なるか
 
 
 class MustrenewValidatorError(ValidatorErrorEnum):
@@ -18,6 +28,10 @@ class MustrenewValidatorError(ValidatorErrorEnum):
     class MUSTRENEW_OLD(NamedTuple):
         """最新版が旧部品を引用している部品の旧版を引用している"""
 
+    @error_code("v")
+    class MUSTRENEW_VERSION(VersionInfo):
+        """引用している旧版と最新版との差（全版のデータがある場合のみ）"""
+
 
 E = MustrenewValidatorError
 
@@ -31,21 +45,65 @@ class MustrenewValidator(SingleErrorValidator):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.mustrenew_quoters: dict[str, QuoterInfo] = {}
+        self.versions: VersionStore | None = None
+        self.version_info: dict[str, VersionInfo] = {}
+
+    def setup(self, dump: Dump):
+        self.versions = dump.versions
+
+    def get_version_info(self, ctx: ValidatorContext, part: PartName) -> VersionInfo:
+        assert self.versions is not None and part.version is not None
+        version = int(part.version)
+        latest_version = self.versions.get_latest_version(part.base)
+        if latest_version is None:
+            return VersionInfo(version, None, None, None)
+        old_data = self.versions.get(part.base, version)
+        latest = ctx.dump.get(part.base)
+        return VersionInfo(
+            version,
+            latest_version,
+            latest_version - version,
+            None if old_data is None or latest is None else old_data != latest.gdata,
+        )
 
     @filters.check_only(-filters.is_alias)
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     def is_invalid(self, ctx: ValidatorContext):
         for line in ctx.glyph.kage.lines:
-            if line.stroke_type != 99 or "@" not in line.part_name:
+            if line.stroke_type != 99 or line.part.version is None:
                 continue
             part_name = line.part_name
             if part_name not in self.mustrenew_quoters:
-                quoted = line.part_name.split("@", 1)[0]
+                quoted = line.part.base
                 is_old = quoted in ctx.dump and "@" in ctx.dump[quoted].gdata
                 self.mustrenew_quoters[part_name] = QuoterInfo(is_old, set())
+                if self.versions is not None and line.part.version.isdigit():
+                    self.version_info[part_name] = self.get_version_info(ctx, line.part)
             self.mustrenew_quoters[part_name].quoters.add(ctx.glyph.name)
         return False
 
+    def get_state(self) -> dict[str, Any]:
+        state = super().get_state()
+        state["mustrenew_quoters"] = {
+            part_name: [is_old, sorted(quoters)]
+            for part_name, (is_old, quoters) in self.mustrenew_quoters.items()
+        }
+        state["version_info"] = {
+            part_name: list(info) for part_name, info in self.version_info.items()
+        }
+        return state
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        super().set_state(state)
+        self.mustrenew_quoters = {
+            part_name: QuoterInfo(is_old, set(quoters))
+            for part_name, (is_old, quoters) in state["mustrenew_quoters"].items()
+        }
+        self.version_info = {
+            part_name: VersionInfo(*info)
+            for part_name, info in state["version_info"].items()
+        }
+
     def get_result(self):
         no_old: list[list[str]] = []
         old: list[list[str]] = []
@@ -55,7 +113,13 @@ class MustrenewValidator(SingleErrorValidator):
                 old.append([part_name] + sorted(quoters))
             else:
                 no_old.append([part_name] + sorted(quoters))
-        return {
+        result = {
             E.MUSTRENEW_NO_OLD.errcode: no_old,
             E.MUSTRENEW_OLD.errcode: old,
         }
+        if self.versions is not None:
+            result[E.MUSTRENEW_VERSION.errcode] = [
+                [part_name, *self.version_info[part_name]]
+                for part_name in sorted(self.version_info.keys())
+            ]
+        return result
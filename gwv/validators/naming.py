@@ -5,7 +5,13 @@ from typing import TYPE_CHECKING, NamedTuple
 
 from gwv import filters
 from gwv.helper import GWGroupLazyLoader, load_package_data
-from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
+from gwv.idsparser import parse_ids
+from gwv.validators import (
+    CappedRows,
+    SingleErrorValidator,
+    ValidatorErrorEnum,
+    error_code,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -85,21 +91,11 @@ _re_valid_cdp = re.compile(
 )
 
 _re_ids_head = re.compile(r"(kumimoji|u2ff[\da-f]|u31ef)-")
-_re_idc_1 = re.compile(r"\bu2ff[ef]\b")
-_re_idc_2 = re.compile(r"\b(u2ff[014-9a-d]|u31ef)\b")
-_re_idc_3 = re.compile(r"\bu2ff[23]\b")
-_re_kanji = re.compile(
-    r"""\b(?:
-        u[23]?[\da-f]{4}(?:-u(?:e01[\da-f]{2}|fe0[\da-f]))?|
-        cdp[on]?-[\da-f]{4}
-    )\b""",
-    re.VERBOSE,
-)
-_re_ids_kanji = re.compile(r"１-漢|２-漢-漢|３-漢-漢-漢")
-_re_ucs = re.compile(r"\bu[23]?[\da-f]{4}\b")
 
 
 class NamingValidator(SingleErrorValidator):
+    bounded_errcodes = {E.NAMING_RULE_VIOLATION.errcode: CappedRows}
+
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     def is_invalid(self, ctx: ValidatorContext):
         isHenka = False
@@ -125,33 +121,27 @@ class NamingValidator(SingleErrorValidator):
                     return E.PROHIBITED_GLYPH_NAME()
 
         if _re_ids_head.match(name):
-            idsReplacedName = name
-            idsReplacedName = idsReplacedName.removeprefix("kumimoji-")
-            idsReplacedName = _re_idc_1.sub("１", idsReplacedName)
-            idsReplacedName = _re_idc_2.sub("２", idsReplacedName)
-            idsReplacedName = _re_idc_3.sub("３", idsReplacedName)
-            idsReplacedName = _re_kanji.sub("漢", idsReplacedName)
-
-            while _re_ids_kanji.search(idsReplacedName):
-                idsReplacedName = _re_ids_kanji.sub("漢", idsReplacedName)
-            if idsReplacedName != "漢":
-                return E.INVALID_IDS(idsReplacedName)  # 不正なIDS
-
-            for m in _re_cdp.finditer(name):
-                cdp = m.group(0)
-                cdpv = m.group(1)
-                if cdpv and cdp not in cdp_dict:
+            ids = parse_ids(name.removeprefix("kumimoji-"))
+            if not ids.is_valid:
+                return E.INVALID_IDS(ids.replaced)  # 不正なIDS
+
+            components = [
+                token.text for token in ids.tokens if token.kind == "component"
+            ]
+            for cdp in components:
+                if not cdp.startswith("cdp"):
+                    continue
+                if not cdp.startswith("cdp-") and cdp not in cdp_dict:
                     cdp = "cdp-" + cdp[-4:]
                 if cdp in cdp_dict:
                     # UCSで符号化済みのCDP外字
                     return E.ENCODED_CDP_IN_IDS(cdp, cdp_dict[cdp])
 
-            for m in _re_ucs.finditer(name):
-                ucs = m.group(0)
+            for ucs in components:
                 if ucs == "u3013":
-                    return E.INVALID_IDS(idsReplacedName)  # 〓
+                    return E.INVALID_IDS(ids.replaced)  # 〓
                 if "ue000" <= ucs <= "uf8ff":
-                    return E.INVALID_IDS(idsReplacedName)  # 私用領域
+                    return E.INVALID_IDS(ids.replaced)  # 私用領域
             return False
 
         if rules["rule"].match(name):
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, NamedTuple
 
-from gwv.validators import Validator, ValidatorErrorEnum, error_code
+from gwv.validators import SampledRows, Validator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
     from gwv.validatorctx import ValidatorContext
@@ -38,6 +38,13 @@ _re_invalid_chars = re.compile(r"[^\da-z_\:@-]")
 
 
 class NumexpValidator(Validator):
+    content_local = True
+
+    bounded_errcodes = {e.errcode: SampledRows for e in E}
+
+    def content_key(self, ctx: ValidatorContext):
+        return None
+
     def validate(self, ctx: ValidatorContext) -> None:
         for i, line in enumerate(ctx.glyph.gdata.split("$")):
             if line == "":
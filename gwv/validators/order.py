@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-import re
 from typing import TYPE_CHECKING, NamedTuple
 
 from gwv import filters
-from gwv.helper import RE_REGIONS
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
@@ -44,9 +42,6 @@ class OrderValidatorError(ValidatorErrorEnum):
 E = OrderValidatorError
 
 
-_re_vars = re.compile(r"-" + RE_REGIONS + r"?(\d{2})(-(var|itaiji)-\d{3})?(@|$)")
-
-
 class OrderValidator(SingleErrorValidator):
     @filters.check_only(-filters.is_alias)
     @filters.check_only(-filters.is_of_category({"user-owned"}))
@@ -58,9 +53,8 @@ class OrderValidator(SingleErrorValidator):
         last = ctx.glyph.kage.lines[-1]
         if first.stroke_type == 99:
             fG = first.part_name
-            m = _re_vars.search(fG)
-            if m:
-                henka = m.group(1)
+            henka = first.part.henka
+            if henka is not None:
                 if henka == "02":
                     return E.RIGHT_PART_FIRST(fG)  # 右部品が最初
                 if henka in ("04", "14", "24"):
@@ -69,9 +63,8 @@ class OrderValidator(SingleErrorValidator):
                     return E.INNER_PART_FIRST(fG)  # 囲み内側部品が最初
         if last.stroke_type == 99:
             lG = last.part_name
-            m = _re_vars.search(lG)
-            if m:
-                henka = m.group(1)
+            henka = last.part.henka
+            if henka is not None:
                 if henka == "01":
                     return E.LEFT_PART_LAST(lG)  # 左部品が最後
                 if henka == "03":
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
 import math
 from typing import TYPE_CHECKING, NamedTuple
 
 from gwv import filters
 from gwv.helper import isYoko
 from gwv.validators import (
+    TopKRows,
     Validator,
     ValidatorErrorEnum,
     ValidatorErrorTupleRecorder,
@@ -65,16 +67,33 @@ E = SkewValidatorError
 
 class SkewValidatorErrorRecorder(ValidatorErrorTupleRecorder):
     def get_result(self):
-        for key, val in self._results.items():
+        result = super().get_result()
+        for key, val in result.items():
             if key != E.HORI_TATEBARAI_FIRST.errcode:
                 # 歪み角度が大きい順にソート
                 val.sort(key=lambda r: r[2], reverse=True)
-        return super().get_result()
+        return result
+
+
+def _angle(row: list) -> float:
+    return row[2]
 
 
 class SkewValidator(Validator):
     recorder_cls = SkewValidatorErrorRecorder
 
+    # 歪み角度が大きい順に limit 件まで
+    bounded_errcodes = {
+        e.errcode: functools.partial(TopKRows, key=_angle)
+        for e in E
+        if e is not E.HORI_TATEBARAI_FIRST
+    }
+
+    content_local = True
+
+    def content_key(self, ctx: ValidatorContext):
+        return ctx.category == "user-owned"
+
     @filters.check_only(-filters.is_alias)
     @filters.check_only(-filters.is_of_category({"user-owned"}))
     def validate(self, ctx: ValidatorContext) -> None:
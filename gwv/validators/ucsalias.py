@@ -51,6 +51,8 @@ _re_ids = re.compile(r"(u2ff[\da-f]|u31ef)-")
 
 
 class UcsaliasValidator(SingleErrorValidator):
+    dump_indexes = ("relations",)
+
     @filters.check_only(+filters.is_alias)
     @filters.check_only(+filters.is_of_category({"ucs-kanji", "ucs-hikanji"}))
     def is_invalid(self, ctx: ValidatorContext):
@@ -61,7 +63,7 @@ class UcsaliasValidator(SingleErrorValidator):
             m = _re_tail_var_itaiji.fullmatch(name_tail)
             if m:
                 var_or_itaiji = m.group(1)
-                if nomark not in ctx.dump:
+                if ctx.glyph.name not in ctx.dump.relations.nomark:
                     return False  # 無印が見つからない
                 nomark_entity = ctx.dump.get_entity_name(nomark)
                 if var_or_itaiji == "var":
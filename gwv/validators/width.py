@@ -8,6 +8,7 @@ from gwv.helper import RE_REGIONS, GWGroupLazyLoader
 from gwv.validators import SingleErrorValidator, ValidatorErrorEnum, error_code
 
 if TYPE_CHECKING:
+    from gwv.dump import Dump
     from gwv.validatorctx import ValidatorContext
 
 
@@ -91,6 +92,11 @@ buhinWidths: dict[str, tuple[float, float]] = {
 
 
 class WidthValidator(SingleErrorValidator):
+    def setup(self, dump: Dump):
+        nonspacinghalflist.get_data()
+        for halflist in halflists:
+            halflist.get_data()
+
     @filters.check_only(
         -filters.is_of_category({"ids", "ucs-kanji", "cdp", "koseki", "ext", "bsh"})
     )
@@ -122,7 +128,7 @@ class WidthValidator(SingleErrorValidator):
                 else:
                     (xL, _yL), (xR, _yR) = coords
                     w = xR - xL
-                    gn: str = line.part_name.split("@")[0]
+                    gn = line.part.base
                     if gn in buhinWidths:
                         bb = buhinWidths[gn]
                         bL = xL + w * bb[0] / 200.0
@@ -0,0 +1,201 @@
+"""Store of all the versions of the glyphs, made from dump_all_versions.txt.
+
+The versions of a glyph are delta-encoded: every KEYFRAME_INTERVAL-th version
+(and any version whose delta is not smaller) is stored in full, and the others
+as the edits of the KAGE lines from the previous version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator, Sequence
+
+log = logging.getLogger(__name__)
+
+KEYFRAME_INTERVAL = 8
+
+_SCHEMA = """
+CREATE TABLE versions (
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    related TEXT NOT NULL,
+    is_delta INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (name, version)
+) WITHOUT ROWID;
+"""
+
+_BATCH_SIZE = 10000
+
+
+def make_delta(old: str, new: str) -> str:
+    """Encode new as the edits of the KAGE lines of old."""
+    old_lines = old.split("$")
+    new_lines = new.split("$")
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    edits = [
+        [i1, i2, new_lines[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+    return json.dumps(edits, separators=(",", ":"))
+
+
+def apply_delta(old: str, delta: str) -> str:
+    lines = old.split("$")
+    # Apply from the end so that the indices of the earlier edits stay valid
+    for i1, i2, new_lines in reversed(json.loads(delta)):
+        lines[i1:i2] = new_lines
+    return "$".join(lines)
+
+
+def _iter_all_versions(filepath: Path) -> Iterator[tuple[str, int, str, str]]:
+    with filepath.open() as fp:
+        fp.readline()  # header
+        fp.readline()  # ------
+        for line in iter(fp.readline, ""):
+            row = [x.strip() for x in line.split("|")]
+            if len(row) != 3:
+                continue
+            name, at, version = row[0].partition("@")
+            if not at or not version.isdigit():
+                continue
+            yield name, int(version), row[1], row[2]
+
+
+class VersionStore:
+    """All versions of the glyphs in a database made by VersionStore.create."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(self.path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+
+    @classmethod
+    def create(
+        cls, path: str | os.PathLike, dump_path: str | os.PathLike
+    ) -> VersionStore:
+        """Import dump_all_versions.txt into a new database at path."""
+        conn = sqlite3.connect(path)
+        n_versions = n_deltas = 0
+        try:
+            with conn:
+                conn.executescript(_SCHEMA)
+                # The dump is not sorted by the version, so load it into a
+                # temporary table first and then encode each glyph in order
+                conn.execute(
+                    "CREATE TEMP TABLE raw (name TEXT, version INTEGER, "
+                    "related TEXT, data TEXT)"
+                )
+                conn.executemany(
+                    "INSERT INTO raw VALUES (?, ?, ?, ?)",
+                    _iter_all_versions(Path(dump_path)),
+                )
+                rows = conn.execute(
+                    "SELECT name, version, related, data FROM raw "
+                    "ORDER BY name, version"
+                )
+                batch: list[tuple[str, int, str, int, str]] = []
+                prev_name = prev_data = None
+                n_since_key = 0
+                for name, version, related, data in rows:
+                    is_delta = False
+                    stored = data
+                    if name == prev_name and n_since_key < KEYFRAME_INTERVAL - 1:
+                        assert prev_data is not None
+                        delta = make_delta(prev_data, data)
+                        if len(delta) < len(data):
+                            is_delta = True
+                            stored = delta
+                    n_since_key = n_since_key + 1 if is_delta else 0
+                    batch.append((name, version, related, is_delta, stored))
+                    prev_name, prev_data = name, data
+                    n_versions += 1
+                    n_deltas += is_delta
+                    if len(batch) >= _BATCH_SIZE:
+                        conn.executemany(
+                            "INSERT INTO versions VALUES (?, ?, ?, ?, ?)", batch
+                        )
+                        batch.clear()
+                conn.executemany("INSERT INTO versions VALUES (?, ?, ?, ?, ?)", batch)
+                conn.execute("DROP TABLE raw")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        log.info(
+            "Imported %d versions (%d delta-encoded) into %s",
+            n_versions,
+            n_deltas,
+            path,
+        )
+        return cls(path)
+
+    def get_versions(self, name: str) -> list[int]:
+        """Return the version numbers of the glyph in ascending order."""
+        return [
+            version
+            for (version,) in self._conn.execute(
+                "SELECT version FROM versions WHERE name = ? ORDER BY version",
+                (name,),
+            )
+        ]
+
+    def get_latest_version(self, name: str) -> int | None:
+        (version,) = self._conn.execute(
+            "SELECT MAX(version) FROM versions WHERE name = ?", (name,)
+        ).fetchone()
+        return version
+
+    def get(self, name: str, version: int) -> str | None:
+        """Return the data of the version of the glyph, or None if there is no
+        such version."""
+        # The versions from the last keyframe up to the requested one
+        rows = self._conn.execute(
+            "SELECT version, data FROM versions WHERE name = ? AND version <= ? "
+            "AND version >= (SELECT MAX(version) FROM versions "
+            "WHERE name = ? AND version <= ? AND is_delta = 0) "
+            "ORDER BY version",
+            (name, version, name, version),
+        ).fetchall()
+        if not rows or rows[-1][0] != version:
+            return None
+        data = rows[0][1]
+        for _version, delta in rows[1:]:
+            data = apply_delta(data, delta)
+        return data
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def main(args: Sequence[str] | None = None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Import dump_all_versions.txt of GlyphWiki into a database of "
+        "delta-encoded versions that gwv can use with --versions"
+    )
+    parser.add_argument("dumpfile", type=Path)
+    parser.add_argument("dbfile", type=Path, help="Database file to create")
+    opts = parser.parse_args(args)
+
+    if opts.dbfile.exists():
+        parser.error(f"{opts.dbfile} already exists")
+    logging.basicConfig(level=logging.INFO)
+    VersionStore.create(opts.dbfile, opts.dumpfile)
+
+
+if __name__ == "__main__":
+    main()
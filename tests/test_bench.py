@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.bench.compare import CORPUS_SIZE, Regression, compare_reports
+from gwv.bench.suite import measure_validator
+from gwv.bench.synth import generate, generate_dump, write_dump
+from gwv.dump import Dump
+from gwv.helper import categorize
+
+
+class TestSynth(unittest.TestCase):
+    def test_generate(self):
+        data = generate(3000, seed=1)
+        self.assertEqual(len(data), 3000)
+        self.assertEqual(data, generate(3000, seed=1))
+        self.assertNotEqual(data, generate(3000, seed=2))
+
+        categories = {categorize(name)[0] for name in data}
+        self.assertLessEqual(
+            {"ucs-kanji", "ucs-hikanji", "ids", "koseki", "toki", "cdp"}, categories
+        )
+        # Aliases of existing glyphs
+        dump = Dump(data, 0.0)
+        self.assertTrue(any(dump[name].entity_name in dump for name in dump))
+
+    def test_write_dump(self):
+        data = generate(500)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dump_newest_only.txt"
+            write_dump(data, path)
+            self.assertEqual(Dump.open(path)._data, data)
+
+
+class TestSuite(unittest.TestCase):
+    def test_measure_validator(self):
+        measurements = measure_validator(generate_dump(500), "corner")
+        self.assertLessEqual(
+            {"setup", "validate", "get_result", "glyphs_per_sec", "errors"},
+            measurements.keys(),
+        )
+        self.assertGreater(measurements["glyphs_per_sec"], 0)
+
+
+class TestCompare(unittest.TestCase):
+    @staticmethod
+    def _report(**validators):
+        return {"sizes": {str(CORPUS_SIZE): {"validators": validators}}}
+
+    def test_compare_reports(self):
+        def measurements(validate, rss):
+            return {
+                "setup": 0.01,
+                "validate": validate,
+                "get_result": 0.01,
+                "peak_rss_kb": rss,
+            }
+
+        baseline = self._report(
+            corner=measurements(1.0, 100000),
+            skew=measurements(1.0, 100000),
+            dup=measurements(0.01, 100000),
+            mj=measurements(1.0, 100000),
+        )
+        current = self._report(
+            corner=measurements(1.5, 100000),
+            skew=measurements(1.1, 200000),
+            # Within the noise
+            dup=measurements(0.04, 100000),
+            mj={"error": "RuntimeError: "},
+            ids=measurements(1.0, 100000),
+        )
+        regressions, missing = compare_reports(baseline, current, tolerance=0.25)
+        self.assertEqual(
+            regressions,
+            [
+                Regression("corner", "validate", 1.0, 1.5),
+                Regression("skew", "memory", 100000, 200000),
+                Regression("mj", "error", None, None),
+            ],
+        )
+        self.assertEqual(missing, ["ids"])
+        self.assertIn("corner: validate regressed", regressions[0].describe())
+
+    def test_calibration(self):
+        def measurements(validate, growth):
+            return {
+                "setup": 0.01,
+                "validate": validate,
+                "get_result": 0.01,
+                "peak_rss_kb": 100000 + growth,
+                "rss_growth_kb": growth,
+            }
+
+        baseline = {
+            **self._report(corner=measurements(1.0, 10000)),
+            "calibration": 0.1,
+        }
+        # A machine twice as slow
+        current = {
+            **self._report(corner=measurements(2.2, 10000)),
+            "calibration": 0.2,
+        }
+        self.assertEqual(compare_reports(baseline, current), ([], []))
+        current["sizes"][str(CORPUS_SIZE)]["validators"]["corner"] = measurements(
+            2.6, 20000
+        )
+        regressions, _missing = compare_reports(baseline, current)
+        self.assertEqual(
+            regressions,
+            [
+                Regression("corner", "validate", 2.0, 2.6),
+                Regression("corner", "memory", 10000, 20000),
+            ],
+        )
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv import validator
+from gwv.bench.suite import offline_validator_names
+from gwv.bench.synth import generate_dump
+from gwv.checkpoint import Checkpoint, selection_digest
+from gwv.progress import ProgressReporter
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class _InterruptingProgress(ProgressReporter):
+    def __init__(self, stop_at: int):
+        super().__init__(stream=None)
+        self.stop_at = stop_at
+
+    def update(self, done: int) -> None:
+        if done == self.stop_at:
+            raise _Interrupted()
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.dump = generate_dump(1000)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name, "checkpoint.json")
+
+    def _interrupt(self, validator_names: list[str], **kwargs) -> Checkpoint:
+        # A run interrupted after the checkpoint at the 400th glyph
+        checkpoint = Checkpoint(self.path, interval=400)
+        with self.assertRaises(_Interrupted):
+            validator.validate(
+                self.dump,
+                validator_names,
+                checkpoint=checkpoint,
+                progress=_InterruptingProgress(450),
+                **kwargs,
+            )
+        return checkpoint
+
+    def test_resume(self):
+        expected = validator.validate(self.dump, offline_validator_names)
+        checkpoint = self._interrupt(offline_validator_names)
+        self.assertEqual(
+            json.loads(self.path.read_text())["last_glyphname"],
+            sorted(self.dump.keys())[399],
+        )
+        result = validator.validate(
+            self.dump, offline_validator_names, checkpoint=checkpoint, resume=True
+        )
+        # Restored parameters are as they are written out (lists for tuples)
+        self.assertEqual(
+            json.loads(json.dumps(result)), json.loads(json.dumps(expected))
+        )
+
+    def test_mismatch(self):
+        names = ["numexp", "skew"]
+        options = {"skew": {"limit": 10}}
+        checkpoint = self._interrupt(names, validator_options=options)
+        instances = validator.setup_validators(self.dump, names, options)
+        selection = selection_digest(sorted(self.dump.keys()))
+
+        def load(timestamp=self.dump.timestamp, instances=instances, **kwargs):
+            return checkpoint.load(
+                timestamp,
+                instances,
+                **{"selection": selection, "validator_options": options, **kwargs},
+            )
+
+        self.assertEqual(load(), sorted(self.dump.keys())[399])
+        with self.assertRaisesRegex(ValueError, "different dump"):
+            load(self.dump.timestamp + 1)
+        with self.assertRaisesRegex(ValueError, "different validators"):
+            load(instances={"numexp": instances["numexp"]})
+        with self.assertRaisesRegex(ValueError, "different selection"):
+            load(selection=selection_digest(sorted(self.dump.keys())[1:]))
+        with self.assertRaisesRegex(ValueError, "different options"):
+            load(validator_options={"skew": {"limit": 20}})
+
+        data = json.loads(self.path.read_text())
+        data["version"] -= 1
+        self.path.write_text(json.dumps(data))
+        with self.assertRaisesRegex(ValueError, "Unsupported checkpoint version"):
+            load()
+
+    def test_resume_other_selection(self):
+        checkpoint = self._interrupt(["numexp"])
+        with self.assertRaisesRegex(ValueError, "different selection"):
+            validator.validate(
+                self.dump,
+                ["numexp"],
+                glyphnames=sorted(self.dump.keys())[:900],
+                checkpoint=checkpoint,
+                resume=True,
+            )
+        with self.assertRaisesRegex(ValueError, "different options"):
+            validator.validate(
+                self.dump,
+                ["numexp"],
+                validator_options={"numexp": {"limit": 5}},
+                checkpoint=checkpoint,
+                resume=True,
+            )
+
+    def test_missing(self):
+        checkpoint = Checkpoint(self.path)
+        self.assertIsNone(
+            checkpoint.load(self.dump.timestamp, {}, selection="", validator_options={})
+        )
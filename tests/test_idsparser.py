@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import unittest
+
+from gwv.idsparser import IDSOperation, IDSToken, parse_ids
+
+
+class TestIDSParser(unittest.TestCase):
+    def test_valid(self):
+        ids = parse_ids("u2ff0-u6c35-u2ff1-u4e00-u4e8c")
+        self.assertTrue(ids.is_valid)
+        self.assertEqual(ids.replaced, "漢")
+        self.assertEqual(
+            ids.tree,
+            IDSOperation(
+                "u2ff0",
+                (
+                    IDSToken("component", "u6c35"),
+                    IDSOperation(
+                        "u2ff1",
+                        (
+                            IDSToken("component", "u4e00"),
+                            IDSToken("component", "u4e8c"),
+                        ),
+                    ),
+                ),
+            ),
+        )
+
+    def test_components(self):
+        ids = parse_ids("u2ff2-u4e00-ue0101-cdp-8c4e-u2ffe-u20000")
+        self.assertTrue(ids.is_valid)
+        self.assertEqual(
+            [token.name for token in ids.tokens if token.kind == "component"],
+            ["u4e00-ue0101", "cdp-8c4e", "u20000"],
+        )
+
+    def test_invalid(self):
+        self.assertEqual(parse_ids("u2ff0-u4e00").replaced, "２-漢")
+        self.assertEqual(parse_ids("u2ff1-u4e00-abc-u4e01").replaced, "２-漢-abc-漢")
+        self.assertEqual(parse_ids("u2ff0-u4e00-u4e01-u4e02").replaced, "漢-漢")
+        self.assertFalse(parse_ids("u2ff0-u4e00-u4e01-u4e02").is_valid)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import unittest
+
+from gwv.kagedata import KageData, KageLine, kageIntSuppressError
+
+# Lines with the cases that the parser has fast paths or fallbacks for
+LINES = [
+    "0:0:0:0",
+    "1:0:0:12:34:56:34",
+    "1:12:413:24:28:24:164",
+    "2:7:8:30:53:64:99:83:141",
+    "6:7:0:1:2:3:4:5:6:7:8",
+    "7:32:7:76:131:27:32:183:43:48:19",
+    "1::0: 12 :+3",
+    "1:0:0:1.5:x",
+    "1:0:0:-5:200:-0:007",
+    "99:0:0:0:0:200:200:u53e3-04@3:0:0:0",
+    "99:0:0:0:0:200:200:u53e3-j04-var-001@3",
+    "99:0:0:-10:20:190:180:1234",
+    "099:0:0:0:0:200:200:u4e00",
+    "99:0:0:x:0:200:200:u4e00",
+]
+
+
+def _reference_parse(data: str):
+    """Parse the line field by field, as KageLine did before its fast path,
+    and return the data, the part name and the coordinates."""
+    sdata = data.split(":")
+    part_name = None
+    if kageIntSuppressError(sdata[0]) == 99:
+        values = tuple(
+            [kageIntSuppressError(x) if i != 7 else None for i, x in enumerate(sdata)]
+        )
+        if len(sdata) >= 8:
+            part_name = sdata[7]
+        coords = [(values[3], values[4]), (values[5], values[6])]
+    else:
+        values = tuple([kageIntSuppressError(x) for x in sdata])
+        coords = list(zip(values[3::2], values[4::2]))
+    if any(x is None or y is None for x, y in coords):
+        return values, part_name, None
+    return values, part_name, tuple(coords)
+
+
+class TestKageLine(unittest.TestCase):
+    def test_stroke(self):
+        line = KageLine(0, "1:0:0:12:34:56:34")
+        self.assertEqual(line.data, (1, 0, 0, 12, 34, 56, 34))
+
+    def test_part(self):
+        line = KageLine(1, "99:0:0:0:0:200:200:u53e3-04@3:0:0:0")
+        self.assertEqual(line.data, (99, 0, 0, 0, 0, 200, 200, None, 0, 0, 0))
+        self.assertEqual(line.part_name, "u53e3-04@3")
+
+    def test_numeric_part_name(self):
+        line = KageLine(0, "99:0:0:0:0:200:200:1234")
+        self.assertIsNone(line.data[7])
+        self.assertEqual(line.part_name, "1234")
+
+    def test_kageInt_semantics(self):
+        self.assertEqual(KageLine(0, "1::0: 12 :+3").data, (1, 0, 0, 12, 3))
+        self.assertEqual(KageLine(0, "1:0:0:1.5:x").data, (1, 0, 0, None, None))
+        self.assertEqual(KageLine(0, "099:0:0:0:0:200:200:u4e00").part_name, "u4e00")
+        self.assertEqual(KageLine(0, "99:0:0").data, (99, 0, 0))
+
+    def test_part_metadata(self):
+        line1 = KageLine(0, "99:0:0:0:0:200:200:u53e3-j04-var-001@3")
+        line2 = KageLine(1, "99:0:0:0:0:100:200:u53e3-j04-var-001@3")
+        self.assertIs(line1.part, line2.part)
+        part = line1.part
+        self.assertEqual(part.base, "u53e3-j04-var-001")
+        self.assertEqual(part.version, "3")
+        self.assertEqual(part.region, "j")
+        self.assertEqual(part.henka, "04")
+        self.assertEqual(part.variant, "var-001")
+
+        part = KageLine(0, "99:0:0:0:0:200:200:u4ebb-01").part
+        self.assertEqual((part.base, part.version), ("u4ebb-01", None))
+        self.assertEqual((part.region, part.henka), (None, "01"))
+
+
+class TestReference(unittest.TestCase):
+    def test_lines(self):
+        for data in LINES:
+            with self.subTest(data=data):
+                line = KageLine(0, data)
+                part_name = line.part_name if line.stroke_type == 99 else None
+                self.assertEqual(
+                    (line.data, part_name, line.coords), _reference_parse(data)
+                )
+
+    def test_kagedata(self):
+        kage = KageData("$".join(LINES))
+        self.assertEqual(
+            [(line.data, line.coords) for line in kage.lines],
+            [_reference_parse(data)[::2] for data in LINES],
+        )
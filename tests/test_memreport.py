@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.dump import Dump
+from gwv.memreport import MemoryReport, deep_sizeof
+from gwv.validator import validate
+
+
+class TestMemReport(unittest.TestCase):
+    def test_deep_sizeof(self):
+        shared = ["x" * 1000]
+        seen: set[int] = set()
+        size = deep_sizeof([shared, shared], seen)
+        self.assertGreaterEqual(size, sys.getsizeof(shared[0]))
+        self.assertLess(size, 2 * sys.getsizeof(shared[0]))
+        # Already counted
+        self.assertEqual(deep_sizeof(shared, seen), 0)
+
+    def test_report(self):
+        dump = Dump(
+            {
+                "u4e00": ("u3013", "1:0:0:10:100:190:100"),
+                "u4e01": ("u3013", "1:0:0:10:100:190:100$1:0:0:10:100:190:100"),
+            },
+            334.0,
+        )
+        report = MemoryReport()
+        report.phase("load")
+        validate(dump, ["corner", "dup"], memory_report=report)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "memory.json"
+            report.write(path)
+            with path.open() as f:
+                data = json.load(f)
+
+        self.assertEqual(
+            [phase["phase"] for phase in data["phases"]],
+            ["load", "setup:corner", "setup:dup", "validate", "get_result"],
+        )
+        self.assertEqual(set(data["retained"]["validators"]), {"corner", "dup"})
+        self.assertIn("dump_kb", data["retained"])
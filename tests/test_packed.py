@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import mmap
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gwv.helper import CJKSources
+from gwv.packed import CJKSRC_MAGIC, MJTABLE_MAGIC, PackedReader, PackedWriter
+
+STRINGS = ["", "a", "部品", "J0-306C", "𠀋"]
+
+
+class TestPacked(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name, "table.bin")
+
+    def _map(self) -> mmap.mmap:
+        with self.path.open("rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.addCleanup(buf.close)
+        return buf
+
+    def test_roundtrip(self):
+        with self.path.open("wb") as f:
+            writer = PackedWriter(f, MJTABLE_MAGIC)
+            writer.write_uint32_array([0, 1, 0xFFFFFFFF])
+            writer.write_bytes(b"abcde")
+            writer.write_string_array(STRINGS)
+            writer.write_uint32_array([])
+        reader = PackedReader(self._map(), MJTABLE_MAGIC)
+        self.assertEqual(list(reader.read_uint32_array()), [0, 1, 0xFFFFFFFF])
+        self.assertEqual(bytes(reader.read_bytes()), b"abcde")
+        strings = reader.read_string_array()
+        self.assertEqual(len(strings), len(STRINGS))
+        self.assertEqual(strings[2], "部品")
+        self.assertEqual(strings[-1], "𠀋")
+        self.assertEqual(strings[1:4], STRINGS[1:4])
+        with self.assertRaises(IndexError):
+            strings[len(STRINGS)]
+        self.assertEqual(list(reader.read_uint32_array()), [])
+
+    def test_magic(self):
+        with self.path.open("wb") as f:
+            PackedWriter(f, MJTABLE_MAGIC).write_uint32_array([1])
+        with self.assertRaises(ValueError):
+            PackedReader(self._map(), CJKSRC_MAGIC)
+        # A file of an older version of the format
+        with self.assertRaises(ValueError):
+            PackedReader(self.path.read_bytes(), MJTABLE_MAGIC[:-1] + b"\x00")
+
+    def test_cjk_sources(self):
+        first_cp = 0x4E00
+        with self.path.open("wb") as f:
+            writer = PackedWriter(f, CJKSRC_MAGIC)
+            writer.write_uint32_array([first_cp, 2])
+            # u4e00 is in row 1, u4e02 in row 2 and u4e01 in none
+            writer.write_uint32_array([1, 0, 2])
+            writer.write_string_array(["G0-523B", "J0-306C", "J0-3021"])
+            writer.write_uint32_array([1, 0])  # column G
+            writer.write_uint32_array([2, 3])  # column T
+        sources = CJKSources()
+        with mock.patch("gwv.helper.load_package_data", return_value=self._map()):
+            self.assertEqual(sources.get_by_codepoint(0x4E00, 0), "G0-523B")
+        self.assertEqual(sources.get_by_codepoint(0x4E00, 1), "J0-306C")
+        self.assertIsNone(sources.get_by_codepoint(0x4E01, 0))
+        self.assertIsNone(sources.get_by_codepoint(0x4E02, 0))
+        self.assertEqual(sources.get_by_codepoint(0x4E02, 1), "J0-3021")
+        self.assertIsNone(sources.get_by_codepoint(0x4DFF, 0))
+        self.assertIsNone(sources.get_by_codepoint(0x4E03, 0))
+        self.assertEqual(sources.get("u4e02", 1), "J0-3021")
+        self.assertIsNone(sources.get("u4e02-j", 1))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.dump import Dump
+from gwv.progress import ProgressReporter
+from gwv.validator import validate
+
+
+class TestProgressReporter(unittest.TestCase):
+    def test_validate(self):
+        dump = Dump(
+            {f"u4e{i:02x}": ("u3013", "1:0:0:10:100:190:100") for i in range(10)},
+            334.0,
+        )
+        stream = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            textfile = Path(tmpdir) / "gwv.prom"
+            progress = ProgressReporter(
+                interval=0.0, sample_interval=2, stream=stream, textfile=textfile
+            )
+            validate(dump, ["corner", "dup"], progress=progress)
+            metrics = textfile.read_text()
+            self.assertEqual(list(Path(tmpdir).iterdir()), [textfile])
+
+        output = stream.getvalue()
+        self.assertIn("gwv: 2/10 glyphs (20.0%)", output)
+        self.assertIn("gwv: 10/10 glyphs (100.0%)", output)
+        self.assertIn("gwv_glyphs_validated_total 10\n", metrics)
+        self.assertIn('gwv_validator_seconds_total{validator="corner"}', metrics)
+        self.assertIn('gwv_validator_seconds_total{validator="dup"}', metrics)
+
+    def test_sampling(self):
+        progress = ProgressReporter(sample_interval=4, stream=None)
+        progress.start(8, ["corner"])
+        self.assertEqual([i for i in range(1, 9) if progress.is_sampled(i)], [4, 8])
+        progress.add_sample("corner", 0.5)
+        self.assertEqual(progress.validator_times["corner"], 2.0)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import unittest
+
+from gwv.relations import GlyphRelations, get_base_name
+
+
+class TestRelations(unittest.TestCase):
+    def test_get_base_name(self):
+        self.assertEqual(get_base_name("u4e00-var-001"), "u4e00")
+        self.assertEqual(get_base_name("u4e00-j01"), "u4e00-j")
+        self.assertEqual(get_base_name("u4e00-01-var-001"), "u4e00-01")
+        self.assertEqual(get_base_name("cdp-8b4e-u"), "cdp-8b4e")
+        self.assertIsNone(get_base_name("u4e00"))
+
+    def test_relations(self):
+        rel = GlyphRelations(
+            ["u4e00", "u4e00-j", "u4e00-jv", "u4e00-j01", "u4e01-g", "toki-00012340"]
+        )
+        self.assertEqual(rel.nomark["u4e00-jv"], "u4e00")
+        self.assertNotIn("u4e01-g", rel.nomark)
+        self.assertEqual(rel.regional["u4e00"], {"j": "u4e00-j", "jv": "u4e00-jv"})
+        self.assertEqual(rel.children["u4e00-j"], ["u4e00-j01"])
+        self.assertEqual(rel.koseki_of_toki["toki-00012340"], "koseki-012340")
+        self.assertEqual(rel.toki_of_koseki, {})
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gwv import validator
+from gwv.bench.synth import generate_dump
+from gwv.resultcache import ResultCache
+
+# Content-local validators, whose results are cached
+VALIDATOR_NAMES = ["corner", "dup", "illegal", "numexp", "skew"]
+
+
+def _serialized(result):
+    # Cached parameters come back as they are written out (lists for tuples)
+    return json.loads(json.dumps(result))
+
+
+class TestResultCache(unittest.TestCase):
+    def test_reuse(self):
+        dump = generate_dump(500)
+        expected = validator.validate(dump, VALIDATOR_NAMES)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "cache.db")
+            with ResultCache(path) as cache:
+                first = validator.validate(dump, VALIDATOR_NAMES, cache=cache)
+                self.assertEqual(cache.n_hits, 0)
+                self.assertGreater(cache.n_misses, 0)
+            with ResultCache(path) as cache:
+                second = validator.validate(dump, VALIDATOR_NAMES, cache=cache)
+                self.assertGreater(cache.n_hits, 0)
+                self.assertEqual(cache.n_misses, 0)
+        self.assertEqual(first, expected)
+        self.assertEqual(_serialized(second), _serialized(expected))
+
+    def test_codeVersion(self):
+        dump = generate_dump(200)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "cache.db")
+            with ResultCache(path) as cache:
+                validator.validate(dump, VALIDATOR_NAMES, cache=cache)
+            with mock.patch("gwv.resultcache.__version__", "0.0.0+changed"):
+                with ResultCache(path) as cache:
+                    validator.validate(dump, VALIDATOR_NAMES, cache=cache)
+                    self.assertEqual(cache.n_hits, 0)
+                    self.assertGreater(cache.n_misses, 0)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.resultdiff import diff_results
+from gwv.resultformat import iter_result_groups, write_v2
+
+OLD = {
+    "numexp": {
+        "timestamp": 1.0,
+        "result": {
+            "0": [["a", [0, ""]], ["b", [1, ""]], ["c", [2, ""]]],
+            "1": [["a", [0, "x"]]],
+        },
+    },
+}
+NEW = {
+    "numexp": {
+        "timestamp": 2.0,
+        "result": {
+            "0": [["c", [2, ""]], ["b", [3, ""]], ["d", [0, ""]]],
+        },
+    },
+    "skew": {"timestamp": 2.0, "result": {"10": [["a", [0, "y"], 1.5]]}},
+}
+EXPECTED = [
+    ("numexp", "0", "a", "removed"),
+    ("numexp", "0", "b", "changed"),
+    ("numexp", "0", "d", "added"),
+    ("numexp", "1", "a", "removed"),
+    ("skew", "10", "a", "added"),
+]
+
+
+def _summarize(old_path: Path, new_path: Path) -> list[tuple[str, str, str, str]]:
+    return [
+        (r["validator"], r["errcode"], r["glyph"], r["status"])
+        for r in diff_results(old_path, new_path)
+    ]
+
+
+class TestResultDiff(unittest.TestCase):
+    def test_diff(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            old_path = Path(tmpdir, "old.json")
+            new_path = Path(tmpdir, "new.json")
+            old_path.write_text(json.dumps(OLD, sort_keys=True))
+            new_path.write_text(json.dumps(NEW, sort_keys=True))
+            self.assertEqual(_summarize(old_path, new_path), EXPECTED)
+
+    def test_diffV2(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            old_path = Path(tmpdir, "old")
+            new_path = Path(tmpdir, "new")
+            write_v2(OLD, old_path)
+            write_v2(NEW, new_path)
+            self.assertEqual(_summarize(old_path, new_path), EXPECTED)
+
+    def test_unsorted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "result.json")
+            path.write_text(json.dumps({"skew": NEW["skew"], "numexp": OLD["numexp"]}))
+            with self.assertRaises(ValueError):
+                list(iter_result_groups(path))
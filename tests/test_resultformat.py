@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+
+from gwv.resultformat import read_v2, write_v2
+
+
+class TestResultFormat(unittest.TestCase):
+    def test_roundtrip(self):
+        result = {
+            "skew": {
+                "timestamp": 334.0,
+                "result": {"10": [["u4e00", [1, "1:0:2:0:0:200:3"], 1.5]]},
+                "total": {"10": 3},
+            },
+            "donotuse": {
+                "timestamp": 334.0,
+                "result": {"0": [["u4e01", "u4e00-01"], ["u4e02", "a", "u4e00"]]},
+            },
+            "mustrenew": {"timestamp": 334.0, "result": {"@": [], "0": []}},
+            "corner": {"timestamp": 334.0, "result": {"0": [["u4e00", None, 1]]}},
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_v2(result, tmpdir)
+            self.assertEqual(read_v2(tmpdir), result)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.resultstore import ResultStore
+
+
+class TestResultStore(unittest.TestCase):
+    def test_store(self):
+        result1 = {
+            "skew": {
+                "timestamp": 1.0,
+                "result": {
+                    "10": [
+                        ["u4e01", [0, "1:0:0:0:0:200:3"], 1.5],
+                        ["u4e00", [1, ""], 2],
+                    ],
+                },
+                "total": {"10": 5},
+            },
+        }
+        result2 = {
+            "skew": {"timestamp": 2.0, "result": {"10": [["u4e02", [0, ""], 1]]}}
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ResultStore(Path(tmpdir, "store.db")) as store:
+                run1 = store.add_run(result1, 1.0)
+                run2 = store.add_run(result2, 2.0)
+                self.assertEqual(
+                    store.get_errors("skew", "10", run_id=run1, start="u4e01"),
+                    [["u4e01", [0, "1:0:0:0:0:200:3"], 1.5]],
+                )
+                self.assertEqual(
+                    store.get_errors("skew", "10"), [["u4e02", [0, ""], 1]]
+                )
+                self.assertEqual(
+                    store.get_count_history("skew"), [(run1, 1.0, 5), (run2, 2.0, 1)]
+                )
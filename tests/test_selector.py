@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.dump import Dump
+from gwv.selector import read_glyph_list, select_glyphs
+
+NAMES = [
+    "u4e00",
+    "u4e00-j",
+    "u4e01",
+    "u3042",
+    "koseki-000010",
+    "cdp-8c40",
+    "user_abc",
+]
+
+
+class TestSelector(unittest.TestCase):
+    def setUp(self):
+        self.dump = Dump({name: ("u3013", "0:0:0:0") for name in NAMES}, 1.0)
+
+    def test_read_glyph_list(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, "glyphs.txt")
+            path.write_text("# glyphs to check\nu4e00\n\n  u3042  \n#u4e01\n")
+            self.assertEqual(read_glyph_list(path), ["u4e00", "u3042"])
+
+    def test_no_selector(self):
+        self.assertEqual(select_glyphs(self.dump), list(self.dump.keys()))
+
+    def test_missing_names(self):
+        with self.assertLogs("gwv.selector", "WARNING") as logs:
+            selected = select_glyphs(self.dump, names=["u4e01", "u4e02", "u4e00"])
+        self.assertEqual(selected, ["u4e01", "u4e00"])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("u4e02", logs.output[0])
+
+    def test_combined(self):
+        self.assertEqual(
+            select_glyphs(self.dump, patterns=["u4e0?", "u3*"]),
+            ["u4e00", "u4e01", "u3042"],
+        )
+        self.assertEqual(
+            select_glyphs(
+                self.dump,
+                names=["u4e00", "u4e00-j", "u3042", "cdp-8c40", "user_abc"],
+                patterns=["u*", "cdp-*"],
+                categories=["ucs-kanji", "cdp"],
+            ),
+            ["u4e00", "u4e00-j", "cdp-8c40"],
+        )
+        self.assertEqual(
+            select_glyphs(self.dump, patterns=["u4e00*"], categories=["koseki"]), []
+        )
+
+    def test_unknown_category(self):
+        with self.assertRaises(ValueError):
+            select_glyphs(self.dump, categories=["kanji"])
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.dump import Dump
+from gwv.sqlitedump import SQLiteDump
+
+DUMP = """\
+ name | related | data
+------+---------+------
+ u5b57 | u5b57 | 99:0:0:0:0:200:200:u5b80-03$99:0:0:0:0:200:200:u5b50-04@2
+ u5b57-j | u5b57 | 99:0:0:0:0:200:200:u5b57
+ u5b57-jv | u5b57 | 99:0:0:0:0:200:200:u5b57
+ u5b80-03 | u5b80 | 1:0:0:10:10:190:10
+ u5b50-04 | u5b50 | 99:0:0:0:0:200:200:u5b50-04@3:0:0:0
+(5 rows)
+"""
+
+
+class TestSQLiteDump(unittest.TestCase):
+    def test_dump(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dump_path = Path(tmpdir, "dump_newest_only.txt")
+            dump_path.write_text(DUMP)
+            dump = Dump.open(dump_path)
+            db = SQLiteDump.create(Path(tmpdir, "dump.db"), dump_path)
+            try:
+                self.assertEqual(list(db.keys()), list(dump.keys()))
+                self.assertEqual(len(db), 5)
+                self.assertIn("u5b57-j", db)
+                self.assertNotIn("u5b58", db)
+                self.assertIsNone(db.get("u5b58"))
+                self.assertEqual(db["u5b80-03"], dump["u5b80-03"])
+                self.assertEqual(db.timestamp, dump.timestamp)
+                self.assertEqual(db.get_alias_of("u5b57"), dump.get_alias_of("u5b57"))
+                self.assertEqual(db.get_entity_name("u5b57-jv"), "u5b57")
+                self.assertEqual(
+                    db.find_by_related("u5b57"), ["u5b57", "u5b57-j", "u5b57-jv"]
+                )
+                self.assertEqual(db.find_aliases("u5b57"), ["u5b57-j", "u5b57-jv"])
+                self.assertEqual(db.find_quoters("u5b50-04"), ["u5b57", "u5b50-04"])
+            finally:
+                db.close()
+
+    def test_short_quote_line(self):
+        # A malformed quote line without the part name
+        dump_text = DUMP.replace(
+            " u5b80-03 | u5b80 | 1:0:0:10:10:190:10",
+            " u5b80-03 | u5b80 | 1:0:0:10:10:190:10$99:0:0:0",
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dump_path = Path(tmpdir, "dump_newest_only.txt")
+            dump_path.write_text(dump_text)
+            db = SQLiteDump.create(Path(tmpdir, "dump.db"), dump_path)
+            try:
+                self.assertEqual(len(db), 5)
+                self.assertEqual(db.find_quoters("u5b80-03"), ["u5b57"])
+            finally:
+                db.close()
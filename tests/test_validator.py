@@ -3,8 +3,25 @@ from __future__ import annotations
 import unittest
 
 from gwv import validator, validators
+from gwv.bench.synth import generate
 from gwv.dump import Dump
 
+# Validators that do not download data from GlyphWiki
+_offline_validator_names = [
+    name
+    for name in validators.all_validator_names
+    if name not in {"j", "naming", "width"}
+]
+
+
+def _dump_with_shared_gdata() -> Dump:
+    data = generate(2000)
+    # Copies of glyphs under other names, so that several glyphs share gdata
+    for i, (_related, gdata) in enumerate(list(data.values())[::5]):
+        data[f"user_copy{i}"] = ("u3013", gdata)
+        data[f"u{0xF8000 + i:05x}"] = ("u3013", gdata)
+    return Dump(data, 334.0)
+
 
 class TestValidator(unittest.TestCase):
     def test_validateEmpty(self):
@@ -20,3 +37,30 @@ class TestValidator(unittest.TestCase):
 
         dump = Dump({}, timestamp)
         self.assertEqual(validator.validate(dump), expected_output)
+
+    def test_setupValidators(self):
+        names = ["delvar", "kosekitoki", "ucsalias", "corner"]
+        dump = Dump({"u4e00": ("u4e00", "1:0:0:0:0:0:0")}, 334.0)
+        instances = validator.setup_validators(dump, names, {}, workers=3)
+        self.assertEqual(list(instances), names)
+        self.assertIsInstance(instances["delvar"], validators.Validator)
+        self.assertIsNotNone(dump._relations)
+
+    def test_prepareUnknownIndex(self):
+        dump = Dump({}, 334.0)
+        with self.assertRaises(ValueError):
+            dump.prepare("nonexistent")
+
+    def test_dedup(self):
+        dump = _dump_with_shared_gdata()
+        self.assertEqual(
+            validator.validate(dump, _offline_validator_names, dedup=True),
+            validator.validate(dump, _offline_validator_names, dedup=False),
+        )
+
+    def test_getValidatorOptionNames(self):
+        self.assertEqual(
+            validator.get_validator_option_names("donotuse"),
+            {"limit", "report_chain"},
+        )
+        self.assertEqual(validator.get_validator_option_names("corner"), {"limit"})
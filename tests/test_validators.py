@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv import validator
+from gwv.dump import Dump
+from gwv.idsparser import parse_ids
+from gwv.kagedata import KageData, KageLine
+from gwv.validators import (
+    CappedRows,
+    SampledRows,
+    TopKRows,
+    ValidatorErrorTupleRecorder,
+)
+from gwv.validators.donotuse import get_do_not_use_parts
+from gwv.validators.ids import indexOfFirstKanjiBuhinLine
+from gwv.validators.mj import (
+    MJTable,
+    entity_name_to_field_key,
+    glyphname_to_field_key,
+)
+from gwv.versionstore import VersionStore
+
+
+class TestBoundedRows(unittest.TestCase):
+    def test_capped(self):
+        rows = CappedRows(2)
+        for i in range(5):
+            rows.append([f"g{i}"])
+        self.assertEqual(rows.get_rows(), [["g0"], ["g1"]])
+        self.assertEqual(rows.total, 5)
+
+    def test_topk(self):
+        rows = TopKRows(3, key=lambda r: r[1])
+        for i, angle in enumerate([1.0, 3.0, 2.0, 3.0, 0.5, 2.0]):
+            rows.append([f"g{i}", angle])
+        self.assertEqual(rows.get_rows(), [["g1", 3.0], ["g3", 3.0], ["g2", 2.0]])
+        self.assertEqual(rows.total, 6)
+
+    def test_sampled_state(self):
+        rows = SampledRows(10, seed=1)
+        for i in range(100):
+            rows.append([f"g{i}"])
+        resumed = SampledRows(10)
+        resumed.set_state(json.loads(json.dumps(rows.get_state())))
+        for i in range(100, 1000):
+            rows.append([f"g{i}"])
+            resumed.append([f"g{i}"])
+        self.assertEqual(resumed.get_rows(), rows.get_rows())
+        self.assertEqual(len(rows.get_rows()), 10)
+        self.assertEqual(rows.total, 1000)
+
+
+class TestValidatorErrorTupleRecorder(unittest.TestCase):
+    def test_record(self):
+        line = KageLine(1, "1:0:2:68:150:78:153")
+        rec = ValidatorErrorTupleRecorder()
+        rec.record("u4e00", ("10", (line, 1.5)))
+        rec.record("u4e00", ("0", ()))
+        rec.record("u4e01", ("10", (line, 2.0)))
+        expected = {
+            "10": [
+                ["u4e00", (1, "1:0:2:68:150:78:153"), 1.5],
+                ["u4e01", (1, "1:0:2:68:150:78:153"), 2.0],
+            ],
+            "0": [["u4e00"]],
+        }
+        self.assertEqual(rec.get_result(), expected)
+
+        resumed = ValidatorErrorTupleRecorder()
+        resumed.set_state(json.loads(json.dumps(rec.get_state())))
+        self.assertEqual(
+            json.loads(json.dumps(resumed.get_result())),
+            json.loads(json.dumps(expected)),
+        )
+
+
+class TestDonotuse(unittest.TestCase):
+    def setUp(self):
+        self.dump = Dump(
+            {
+                "a": ("u3013", "1:0:0:10:10:190:10$99:0:0:0:0:200:200:do-not-use"),
+                "b": ("u3013", "99:0:0:0:0:200:200:a"),
+                "c": ("u3013", "99:0:0:0:0:200:200:b@3"),
+                "d": ("u3013", "1:0:0:10:10:190:10$99:0:0:0:0:200:200:c"),
+                "e": ("u3013", "1:0:0:10:10:190:10"),
+            },
+            1.0,
+        )
+
+    def test_get_do_not_use_parts(self):
+        self.assertEqual(
+            get_do_not_use_parts(self.dump), {"a": None, "b": "a", "c": "b@3"}
+        )
+
+    def test_report_chain(self):
+        result = validator.validate(self.dump, ["donotuse"])
+        self.assertEqual(result["donotuse"]["result"], {"0": [["d", "c"]]})
+        result = validator.validate(
+            self.dump,
+            ["donotuse"],
+            validator_options={"donotuse": {"report_chain": True}},
+        )
+        self.assertEqual(
+            result["donotuse"]["result"], {"0": [["d", ["c", "b@3", "a"]]]}
+        )
+
+
+class TestMJNames(unittest.TestCase):
+    def test_field_key(self):
+        cases = {
+            "u4e00-ue0100": (MJTable.FIELD_IVS, "u4e00-ue0100"),
+            "u845b-ufe00": (MJTable.FIELD_SVS, "u845b-ufe00"),
+            "u4e00": (MJTable.FIELD_UCS, "4e00"),
+            "u20000-j": (MJTable.FIELD_UCS, "20000"),
+            "u4e00-ue0100-j": (MJTable.FIELD_UCS, "4e00"),
+            "u2ff0-u4e00-u4e01": (None, None),
+            "u31ef-u4e00": (None, None),
+            "koseki-000010": (MJTable.FIELD_KOSEKI, "000010"),
+            "koseki-00001": (None, None),
+            "jmj-000001": (MJTable.FIELD_JMJ, "000001"),
+            "juki-a123": (MJTable.FIELD_JUKI, "a123"),
+            "nyukan-4e00": (MJTable.FIELD_NYUKAN, "4e00"),
+            "toki-00000010": (MJTable.FIELD_TOKI, "00000010"),
+            "dkw-00001": (MJTable.FIELD_DKW, "00001"),
+            "dkw-h0001": (MJTable.FIELD_DKW, "h0001"),
+            "jx1-2000-2121": (MJTable.FIELD_X0213, "1-2121"),
+            "jx1-2004-2121": (MJTable.FIELD_X0213, "1-2121"),
+            "jx1-2001-2121": (None, None),
+            "jx2-2121": (MJTable.FIELD_X0213, "2-2121"),
+            "jsp-2121": (MJTable.FIELD_X0212, "2121"),
+            "shincho-00001": (MJTable.FIELD_SHINCHO, "00001"),
+            "sdjt-00001": (MJTable.FIELD_SDJT, "00001"),
+            "aj1-00001": (None, None),
+            "cdp-8c40": (None, None),
+        }
+        for name, expected in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(glyphname_to_field_key(name), expected)
+                self.assertEqual(entity_name_to_field_key(name), expected)
+
+
+class TestMustrenew(unittest.TestCase):
+    def setUp(self):
+        self.dump = Dump(
+            {
+                "u4e00": ("u3013", "1:0:0:20:20:180:20"),
+                "u4e01": ("u3013", "1:0:0:0:0:0:0$99:0:0:0:0:200:200:u4e00@1"),
+                "u4e02": ("u3013", "1:0:0:0:0:0:0$99:0:0:0:0:200:200:u4e00@3"),
+                "u4e03": ("u3013", "1:0:0:0:0:0:0$99:0:0:0:0:200:200:u4e04@1"),
+            },
+            1.0,
+        )
+
+    def test_versions(self):
+        lines = [
+            " name | related | data",
+            "------",
+            " u4e00@3 | u3013 | 1:0:0:20:20:180:20",
+            " u4e00@2 | u3013 | 1:0:0:10:10:190:10$0:0:0:0",
+            " u4e00@1 | u3013 | 1:0:0:10:10:190:10",
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dump_path = Path(tmpdir, "dump_all_versions.txt")
+            dump_path.write_text("\n".join(lines) + "\n")
+            self.dump.versions = VersionStore.create(
+                Path(tmpdir, "versions.db"), dump_path
+            )
+            try:
+                result = validator.validate(self.dump, ["mustrenew"])
+            finally:
+                self.dump.versions.close()
+        self.assertEqual(
+            result["mustrenew"]["result"]["v"],
+            [
+                ["u4e00@1", 1, 3, 2, True],
+                ["u4e00@3", 3, 3, 0, False],
+                ["u4e04@1", 1, None, None, None],
+            ],
+        )
+
+    def test_no_versions(self):
+        result = validator.validate(self.dump, ["mustrenew"])
+        self.assertNotIn("v", result["mustrenew"]["result"])
+        self.assertEqual(
+            result["mustrenew"]["result"]["0"],
+            [["u4e00@1", "u4e01"], ["u4e00@3", "u4e02"], ["u4e04@1", "u4e03"]],
+        )
+
+
+class TestIds(unittest.TestCase):
+    def test_first_kanji_line(self):
+        def first_line(name: str, gdata: str) -> int | None:
+            line = indexOfFirstKanjiBuhinLine(parse_ids(name).tokens, KageData(gdata))
+            return None if line is None else line.line_number
+
+        gdata = "99:0:0:0:0:100:200:u4e00$99:0:0:100:0:200:200:{}"
+        self.assertEqual(first_line("u2ff0-u4e01-u4e00", gdata.format("u4e01-02")), 1)
+        self.assertEqual(
+            first_line("u2ff0-cdp-8c40-u4e00", gdata.format("cdp-8c40")), 1
+        )
+        self.assertIsNone(first_line("u2ff0-cdp-8c40-u4e00", gdata.format("cdp-8c41")))
+        # Other CDP prefixes match by the prefix alone
+        self.assertEqual(
+            first_line("u2ff0-cdpo-8c40-u4e00", gdata.format("cdpo-8c41")), 1
+        )
+        self.assertEqual(
+            first_line("u2ff0-cdpn-8c40-u4e00", gdata.format("cdpn-8c41-01")), 1
+        )
+        self.assertIsNone(first_line("u2ff0-u4e01-u4e00", "1:0:0:0:0:200:0"))
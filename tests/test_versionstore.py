@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from gwv.versionstore import KEYFRAME_INTERVAL, VersionStore, apply_delta, make_delta
+
+
+class TestVersionStore(unittest.TestCase):
+    def test_delta(self):
+        old = "1:0:0:1:1:2:2$2:0:7:0:0:1:1:2:2$99:0:0:0:0:200:200:u4e00"
+        new = "1:0:0:1:1:2:2$1:0:0:5:5:6:6$99:0:0:0:0:200:200:u4e00$0:0:0:0"
+        self.assertEqual(apply_delta(old, make_delta(old, new)), new)
+        self.assertEqual(apply_delta(old, make_delta(old, old)), old)
+
+    def test_store(self):
+        versions = [
+            "$".join(f"1:0:0:{i}:{j}:200:{j}" for j in range(i % 5 + 1))
+            for i in range(KEYFRAME_INTERVAL * 2 + 3)
+        ]
+        lines = [" name | related | data", "------"]
+        lines += [
+            f" u4e00@{i} | u3013 | {data}"
+            for i, data in reversed(list(enumerate(versions, 1)))
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dump_path = Path(tmpdir, "dump_all_versions.txt")
+            dump_path.write_text("\n".join(lines) + "\n")
+            store = VersionStore.create(Path(tmpdir, "versions.db"), dump_path)
+            try:
+                for i, data in enumerate(versions, 1):
+                    self.assertEqual(store.get("u4e00", i), data)
+                self.assertIsNone(store.get("u4e00", len(versions) + 1))
+                self.assertIsNone(store.get("u4e01", 1))
+                self.assertEqual(store.get_latest_version("u4e00"), len(versions))
+            finally:
+                store.close()